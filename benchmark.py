@@ -0,0 +1,188 @@
+import argparse
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from data.aggregates import AggregateCube
+from data.downsample import downsample_points
+from data.filters import FilterIndex
+from data.percentiles import PercentileIndex
+from data.ranks import RankIndex
+from data.search import PlayerSearchIndex
+from data.similarity import SimilarityIndex
+from data.synthetic import generate_players
+from data.verify_data import COMPACT_STAGE, STAGES
+
+DEFAULT_SIZES = [2_000, 20_000, 200_000]
+
+CLEANING_STAGES = STAGES + [COMPACT_STAGE]
+
+
+def _timed(func, repeat: int, setup=None):
+    # Meilleur temps sur `repeat` exécutions, et résultat de la dernière ;
+    # `setup` prépare l'argument de chaque exécution en dehors du chronomètre
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        args = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+# ------------------| Étapes du nettoyage |------------------
+def bench_cleaning(raw: pd.DataFrame, repeat: int) -> tuple[dict, pd.DataFrame]:
+    timings = {}
+    df = raw
+    for name, stage in CLEANING_STAGES:
+        source = df
+        seconds, df = _timed(lambda data: stage(data, [], verbose=False), repeat, setup=source.copy)
+        timings[name] = seconds
+    return timings, df
+
+
+# ------------------| Calculs du dashboard |------------------
+def bench_dashboard(df: pd.DataFrame, repeat: int, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    players = df["Player"].to_numpy()
+    sample_rows = rng.integers(0, len(df), 20)
+    comps = df["Comp"].dropna().unique()
+    positions = df["Pos"].dropna().unique()
+
+    def histograms():
+        for comp in comps:
+            subset = df[df["Comp"] == comp]
+            for field in ["Gls", "Ast", "MP"]:
+                np.histogram(subset[field].dropna(), bins=30)
+
+    def table_filter():
+        table = df[df["Pos"].isin(positions[:2]) & df["Comp"].isin(comps[:2]) & (df["Gls"] >= 1)]
+        return table.sort_values("Gls", ascending=False)
+
+    def legacy_ranks():
+        for row in sample_rows[:3]:
+            ranked = df.sort_values("Gls", ascending=False).reset_index(drop=True)
+            ranked[ranked["Player"] == players[row]].index[0]
+
+    timings = {
+        "top10_buteurs": _timed(lambda: df.nlargest(10, "Gls"), repeat)[0],
+        "top10_passeurs": _timed(lambda: df.nlargest(10, "Ast"), repeat)[0],
+        "histogrammes_par_championnat": _timed(histograms, repeat)[0],
+        "filtre_tableau": _timed(table_filter, repeat)[0],
+        "classement_tri_complet_x3": _timed(legacy_ranks, repeat)[0],
+    }
+
+    seconds, ranks = _timed(lambda: RankIndex(df), repeat)
+    timings["index_classement_construction"] = seconds
+    timings["index_classement_requetes_x20"] = _timed(
+        lambda: [ranks.rank(row, field) for row in sample_rows for field in ["Gls", "Ast", "G+A"]], repeat)[0]
+
+    seconds, cube = _timed(lambda: AggregateCube(df), repeat)
+    timings["cube_agregats_construction"] = seconds
+
+    def cube_histograms():
+        for comp in comps:
+            for field in ["Gls", "Ast", "MP"]:
+                cube.histogram(field, Comp=comp)
+
+    timings["cube_histogrammes_par_championnat"] = _timed(cube_histograms, repeat)[0]
+    timings["cube_moyennes_poste_x20"] = _timed(
+        lambda: [cube.mean(["Gls_90", "Ast_90", "xG_90", "xAG_90", "G+A_90"], Pos=pos)
+                 for pos in df["Pos"].to_numpy()[sample_rows]], repeat)[0]
+
+    seconds, percentiles = _timed(lambda: PercentileIndex(df), repeat)
+    timings["index_percentiles_construction"] = seconds
+    timings["index_percentiles_lectures_x20"] = _timed(
+        lambda: [percentiles.percentiles(row) for row in sample_rows], repeat)[0]
+
+    seconds, filters = _timed(lambda: FilterIndex(df), repeat)
+    timings["index_filtres_construction"] = seconds
+
+    def table_page():
+        mask = filters.mask({"Pos": positions[:2], "Comp": comps[:2]}, {"Gls": 1})
+        return filters.page(mask, "Gls", ascending=False)
+
+    timings["index_filtres_page_tableau"] = _timed(table_page, repeat)[0]
+
+    x = df["Gls_90"].to_numpy(dtype=np.float64, na_value=np.nan)
+    y = df["Ast_90"].to_numpy(dtype=np.float64, na_value=np.nan)
+    timings["echantillon_nuage_5000"] = _timed(lambda: downsample_points(x, y, 5_000), repeat)[0]
+
+    seconds, similarity = _timed(lambda: SimilarityIndex(df), repeat)
+    timings["index_similarite_construction"] = seconds
+    timings["index_similarite_requetes_x20"] = _timed(
+        lambda: [similarity.similar(row, k=5) for row in sample_rows], repeat)[0]
+
+    seconds, search = _timed(lambda: PlayerSearchIndex(df), repeat)
+    timings["index_recherche_construction"] = seconds
+    queries = [str(players[row]).split(" ")[1][:4] for row in sample_rows]
+    timings["index_recherche_requetes_x20"] = _timed(lambda: [search.search(q) for q in queries], repeat)[0]
+    return timings
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except Exception:
+        return None
+
+
+def run(sizes: list[int], repeat: int = 3, seed: int = 0) -> dict:
+    results = []
+    for size in sizes:
+        raw = generate_players(size, seed=seed)
+        cleaning, cleaned = bench_cleaning(raw, repeat)
+        dashboard = bench_dashboard(cleaned, repeat, seed)
+        for group, timings in [("nettoyage", cleaning), ("dashboard", dashboard)]:
+            for name, seconds in timings.items():
+                results.append({"rows": size, "group": group, "name": name, "seconds": seconds})
+                print(f"{size:>10} {group:<10} {name:<36} {seconds * 1000:10.2f} ms")
+    return {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(),
+            "git": _git_revision(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, previous: dict) -> None:
+    # Ratio temps actuel / temps de référence pour chaque mesure commune
+    before = {(r["rows"], r["group"], r["name"]): r["seconds"] for r in previous["results"]}
+    for r in current["results"]:
+        key = (r["rows"], r["group"], r["name"])
+        if key in before and before[key] > 0:
+            ratio = r["seconds"] / before[key]
+            flag = "  <-- régression" if ratio > 1.2 else ""
+            print(f"{r['rows']:>10} {r['group']:<10} {r['name']:<36} x{ratio:5.2f}{flag}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mesure du nettoyage et des calculs du dashboard sur données synthétiques.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Nombre de lignes générées (ex. 2000 20000 10000000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre d'exécutions par mesure (le meilleur temps est gardé)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_results.json", help="Fichier JSON de résultats")
+    parser.add_argument("--compare", help="Fichier JSON d'une exécution précédente à comparer")
+    args = parser.parse_args()
+
+    report = run(args.sizes, repeat=args.repeat, seed=args.seed)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print("Résultats :", args.output)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
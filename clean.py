@@ -0,0 +1,97 @@
+import argparse
+import json
+import logging
+import sys
+
+from data.batch import EXIT_FAILED, EXIT_NO_INPUT, EXIT_OK, expand_inputs, logger, run_batch
+from data.formats import available_formats
+from data.incremental import CleanedStore
+
+STATUS_LABELS = {"ok": "ok", "warning": "avertissement", "skipped": "ignoré", "failed": "échec", "merged": "fusionné"}
+
+
+def _print_result(record: dict, as_json: bool) -> None:
+    if as_json:
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+        return
+    label = f"[{STATUS_LABELS[record['status']]}]"
+    if record["status"] == "failed":
+        print(f"{label:<16}{record['file']} : {record['error']}", flush=True)
+    elif record["status"] == "skipped":
+        print(f"{label:<16}{record['file']} ({record['reason']})", flush=True)
+    elif record["status"] == "merged":
+        print(f"{label:<16}{record['file']} -> {record['inserted']} ajoutée(s), {record['updated']} mise(s) à jour, "
+              f"{record['unchanged']} inchangée(s) ({record['players']} joueurs)", flush=True)
+    else:
+        print(f"{label:<16}{record['file']} -> {record['output']} "
+              f"({record['rows_in']} -> {record['rows_out']} lignes, {record['seconds']:.2f} s)", flush=True)
+        for err in record["errors"]:
+            print(" " * 16 + "-", err, flush=True)
+
+
+def merge_into_store(args) -> tuple[list[dict], int]:
+    # Fusion incrémentale : fichiers traités un par un, dans l'ordre des noms (journées les plus récentes en dernier)
+    inputs = expand_inputs(args.inputs, exclude=[args.store])
+    if not inputs:
+        return [], EXIT_NO_INPUT
+    store = CleanedStore(args.store, fmt=args.format)
+    results = []
+    for path in sorted(inputs):
+        try:
+            summary = store.merge_file(path, force=args.force)
+        except Exception as e:
+            record = {"file": path, "status": "failed", "error": f"{type(e).__name__}: {e}"}
+        else:
+            if summary is None:
+                record = {"file": path, "status": "skipped", "reason": "déjà fusionné"}
+            else:
+                record = {"file": path, "status": "merged",
+                          **{k: v for k, v in summary.items() if k not in ("changes", "stages")}}
+        results.append(record)
+        logger.info("%s", json.dumps(record, ensure_ascii=False))
+        _print_result(record, args.json)
+    return results, EXIT_FAILED if any(r["status"] == "failed" for r in results) else EXIT_OK
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Nettoyage par lots d'exports de joueurs, sans Streamlit.",
+        epilog="Codes de sortie : 0 = succès, 1 = au moins un fichier en échec, 2 = aucun fichier trouvé.")
+    parser.add_argument("inputs", nargs="+", help="Fichiers, dossiers ou motifs glob (ex. 'exports/**/*.csv')")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("-o", "--output-dir", help="Dossier des fichiers nettoyés")
+    target.add_argument("--store", help="Jeu nettoyé persistant à compléter (fusion incrémentale par joueur)")
+    parser.add_argument("--format", choices=available_formats(), default=None,
+                        help="Format de sortie (par défaut : csv avec -o, arrow si disponible avec --store)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Processus en parallèle (par défaut : nombre de CPU)")
+    parser.add_argument("--compact", action="store_true", help="Catégories et types numériques réduits")
+    parser.add_argument("--memory-limit-mb", type=float, default=None,
+                        help="Lecture par blocs avec ce budget mémoire par fichier (entrées CSV)")
+    parser.add_argument("--force", action="store_true", help="Nettoyer même les fichiers dont l'empreinte n'a pas changé")
+    parser.add_argument("--manifest", default=None, help="Manifeste des empreintes (par défaut : <output-dir>/.clean_manifest.json)")
+    parser.add_argument("--log", default=None, help="Journal JSON Lines (un enregistrement par fichier, ajouté en fin de fichier)")
+    parser.add_argument("--json", action="store_true", help="Sortie standard en JSON Lines")
+    args = parser.parse_args()
+
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if args.log:
+        handler = logging.FileHandler(args.log, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+
+    if args.store:
+        results, code = merge_into_store(args)
+    else:
+        results, code = run_batch(args.inputs, args.output_dir, fmt=args.format or "csv", jobs=args.jobs,
+                                  force=args.force, compact=args.compact, memory_limit_mb=args.memory_limit_mb,
+                                  manifest_path=args.manifest, on_result=lambda r: _print_result(r, args.json))
+
+    if code == EXIT_NO_INPUT:
+        print("Aucun fichier trouvé.", file=sys.stderr)
+    elif not args.json:
+        counts = {}
+        for r in results:
+            counts[r["status"]] = counts.get(r["status"], 0) + 1
+        print("Résumé :", ", ".join(f"{n} {STATUS_LABELS[status]}" for status, n in sorted(counts.items())))
+    sys.exit(code)
@@ -1,14 +1,31 @@
+import functools
+import os
+import time
+import uuid
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from data.verify_data import clean_dataframe
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics.pairwise import cosine_similarity
+from data.aggregates import AggregateCube, bin_edges
+from data.cache import CleanedFrameCache
+from data.downsample import downsample_points
+from data.filters import FilterIndex
+from data.formats import FILE_EXTENSIONS, MIME_TYPES, accepted_extensions, available_formats, to_bytes
+from data.percentiles import MIN_MINUTES, PercentileIndex
+from data.profiling import Profiler, profiling_requested, summarize_log
+from data.ranks import RankIndex
+from data.search import PlayerSearchIndex
+from data.similarity import SimilarityIndex
+from data.sql import EXAMPLE_QUERIES, MAX_RESULT_ROWS, SqlEngine, has_duckdb
 
 # Configuration
 st.set_page_config(page_title="Football Analytics Dashboard", page_icon="⚽", layout="wide", initial_sidebar_state="expanded")
 
+# Mode profilage (SOCCER_STATS_PROFILE=1 ou ?profile=1) : sections et graphiques mesurés, journal JSONL
+session_token = st.session_state.setdefault("session_token", uuid.uuid4().hex)
+profiler = Profiler(profiling_requested(st.query_params.get("profile")), session=session_token)
+
 # CSS optimisé
 st.markdown("""<style>
 .main{background-color:#0e1117}.stMetric{background-color:#1e2130;padding:15px;border-radius:10px;box-shadow:0 4px 6px rgba(0,0,0,0.1)}
@@ -18,59 +35,534 @@ h2{color:#667eea;border-bottom:3px solid #667eea;padding-bottom:10px}h3{color:#a
 .stButton>button:hover{transform:translateY(-2px);box-shadow:0 6px 8px rgba(0,0,0,0.3)}
 </style>""", unsafe_allow_html=True)
 
+# Taille des figures bornée : rendu WebGL au-delà de WEBGL_THRESHOLD points, échantillon au-delà de MAX_SCATTER_POINTS
+WEBGL_THRESHOLD = 1_000
+MAX_SCATTER_POINTS = 5_000
+HISTOGRAM_BINS = 30
+
 # Fonction pour créer des graphiques
-def create_plot(data, chart_type, **kwargs):
+def create_plot(data, chart_type, keep=None, bins=None, **kwargs):
     plot_config = {'plot_bgcolor':'rgba(0,0,0,0)', 'paper_bgcolor':'rgba(0,0,0,0)', 'font_color':'white', 'showlegend':False}
-    fig = getattr(px, chart_type)(data, **kwargs)
+    if chart_type == 'histogram':
+        # Histogramme calculé côté serveur : seuls les comptes par intervalle sont envoyés au navigateur.
+        # bins : (comptes, bornes) déjà calculés, ou nombre d'intervalles
+        field = kwargs.pop('x')
+        if bins is None or np.isscalar(bins):
+            values = data[field].to_numpy(dtype=np.float64, na_value=np.nan)
+            edges = bin_edges(values, bins or HISTOGRAM_BINS)
+            counts, _ = np.histogram(values[~np.isnan(values)], bins=edges)
+        else:
+            counts, edges = bins
+        data = pd.DataFrame({field: (edges[:-1] + edges[1:]) / 2, 'count': counts})
+        fig = px.bar(data, x=field, y='count', **kwargs)
+        fig.update_traces(width=np.diff(edges))
+        plot_config['bargap'] = 0
+    elif chart_type == 'scatter':
+        # Nuage échantillonné selon la densité ; les lignes de `keep` et les points extrêmes restent affichés
+        if len(data) > MAX_SCATTER_POINTS:
+            rows = downsample_points(data[kwargs['x']].to_numpy(dtype=np.float64, na_value=np.nan),
+                                     data[kwargs['y']].to_numpy(dtype=np.float64, na_value=np.nan),
+                                     MAX_SCATTER_POINTS, keep=keep)
+            data = data.iloc[rows]
+        if len(data) > WEBGL_THRESHOLD:
+            kwargs.setdefault('render_mode', 'webgl')
+        fig = px.scatter(data, **kwargs)
+    else:
+        fig = getattr(px, chart_type)(data, **kwargs)
     fig.update_layout(**plot_config)
     return fig
 
+def show_chart(name, fig, started):
+    # started : début de la construction de la figure ; en mode profilage, durées et taille envoyée
+    profiler.figure(name, fig, time.perf_counter() - started)
+    st.plotly_chart(fig, use_container_width=True)
+
+def profiled(name):
+    # Section mesurée à chaque exécution, y compris quand un fragment se réexécute seul
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiler.section(name):
+                result = func(*args, **kwargs)
+            profiler.flush()
+            return result
+        return wrapper
+    return decorator
+
+SEARCH_FIELD_LABELS = {"Joueur": "Player", "Club": "Squad", "Nation": "Nation"}
+SEARCH_LIMIT = 200
+TABLE_PAGE_SIZE = 50
+STAGE_LABELS = {
+    "lecture": "📂 Lecture",
+    "conversion_numerique": "🔢 Conversion numérique",
+    "doublons": "👥 Doublons",
+    "valeurs_manquantes": "🕳️ Valeurs manquantes",
+    "valeurs_aberrantes": "📈 Valeurs aberrantes",
+    "corrections": "🔧 Corrections",
+    "compaction": "🗜️ Compaction",
+    "fusion": "🔗 Fusion des fichiers",
+}
+# Rafraîchissement de la barre de progression du nettoyage (secondes)
+PROGRESS_INTERVAL = 0.2
+
+# Cache partagé entre sessions : un même fichier n'est lu et nettoyé qu'une fois
+@st.cache_resource
+def get_cleaned_cache():
+    return CleanedFrameCache(max_entries=8, persist_dir=os.environ.get("SOCCER_STATS_CACHE_DIR"), compact=True)
+
+def progress_text(job):
+    if job.stage is None:
+        return "🧹 Nettoyage en cours..."
+    step = STAGE_LABELS.get(job.stage, job.stage) + (f" · {job.source}" if job.source else "")
+    return f"🧹 Nettoyage en cours... {step} ({job.done}/{job.total})"
+
+def wait_for_cleaning(files):
+    # Nettoyage en arrière-plan partagé entre sessions : progression par étape et annulation.
+    # None si la session a annulé ce nettoyage
+    cache = get_cleaned_cache()
+    key = cache.key(files)
+    if st.session_state.get("cancelled_cleaning") == key:
+        st.info("⏹️ Nettoyage annulé.")
+        if st.button("🔄 Relancer le nettoyage", key="restart_cleaning"):
+            del st.session_state["cancelled_cleaning"]
+            st.rerun()
+        return None
+
+    job = cache.start_many(files)
+    if not job.finished:
+        token = session_token
+        job.attach(token)
+        # Le clic relance le script : le travail n'est annulé que si aucune autre session ne l'attend
+        if st.button("⏹️ Annuler le nettoyage", key="cancel_cleaning"):
+            job.detach(token)
+            st.session_state["cancelled_cleaning"] = key
+            st.rerun()
+        bar = st.progress(job.progress, text=progress_text(job))
+        while not job.wait(PROGRESS_INTERVAL):
+            bar.progress(job.progress, text=progress_text(job))
+        bar.empty()
+        job.detach(token)
+    return job.get()
+
+# Sections de la page : chaque fragment ne se réexécute que lorsque ses propres widgets changent
+@profiled("vue_globale.top_joueurs")
+def render_top_players(df):
+    # TOP 10 BUTEURS
+    st.markdown("### ⚽ Top 10 Buteurs")
+    started = time.perf_counter()
+    top_scorers = df.nlargest(10, 'Gls')[['Player','Gls','Squad','Comp']]
+    fig_scorers = create_plot(top_scorers, 'bar', x='Gls', y='Player', orientation='h', color='Gls', 
+                     color_continuous_scale='Reds', text='Gls', hover_data=['Squad','Comp'])
+    fig_scorers.update_traces(textposition='outside')
+    fig_scorers.update_layout(height=400)
+    show_chart('top_buteurs', fig_scorers, started)
+
+    st.markdown("---")
+
+    # TOP 10 PASSEURS
+    st.markdown("### 🎯 Top 10 Passeurs")
+    started = time.perf_counter()
+    top_assist = df.nlargest(10, 'Ast')[['Player','Ast','Squad','Comp']]
+    fig_assist = create_plot(top_assist, 'bar', x='Ast', y='Player', orientation='h', color='Ast', 
+                     color_continuous_scale='Greens', text='Ast', hover_data=['Squad','Comp'])
+    fig_assist.update_traces(textposition='outside')
+    fig_assist.update_layout(height=400)
+    show_chart('top_passeurs', fig_assist, started)
+
+@st.fragment
+@profiled("vue_globale.championnats")
+def render_league_analysis(entry):
+    df = entry.df
+    st.markdown("---\n## 🏆 Analyse par Championnat")
+    competitions = ['Tous'] + sorted(df['Comp'].unique().tolist())
+    selected_comp = st.selectbox("Sélectionnez un championnat", competitions)
+    cube = entry.derived("aggregates", AggregateCube)
+    comp_groups = {} if selected_comp == 'Tous' else {'Comp': selected_comp}
+
+    # Distributions
+    col1, col2, col3 = st.columns(3)
+    charts = [
+        (col1, 'Gls', 'Buts', '#667eea'),
+        (col2, 'Ast', 'Assists', '#764ba2'),
+        (col3, 'MP', 'Matchs Joués', '#f093fb')
+    ]
+
+    for col, field, title, color in charts:
+        with col:
+            # Histogramme pré-calculé par le cube
+            started = time.perf_counter()
+            fig = create_plot(None, 'histogram', x=field, bins=cube.histogram(field, **comp_groups),
+                             title=f'Distribution des {title}',
+                             color_discrete_sequence=[color])
+            show_chart(f'histogramme_{field}', fig, started)
+
+@st.fragment
+@profiled("vue_globale.tableau")
+def render_player_table(entry, export_format="csv"):
+    df = entry.df
+    st.markdown("---\n## 📊 Tableau des Joueurs")
+    filter_index = entry.derived("filters", FilterIndex)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        pos_filter = st.multiselect("Position", filter_index.values('Pos'))
+    with col2:
+        comp_filter = st.multiselect("Championnat", filter_index.values('Comp'))
+    with col3:
+        min_goals = st.slider("Buts minimum", 0, int(df['Gls'].max()), 0)
+
+    display_cols = ['Player','Pos','Squad','Comp','Age','MP','Gls','Ast','G+A','xG','Min']
+    mask = filter_index.mask({'Pos': pos_filter, 'Comp': comp_filter}, {'Gls': min_goals})
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        sort_col = st.selectbox("Trier par", display_cols, index=display_cols.index('Gls'))
+    with col2:
+        sort_order = st.radio("Ordre", ["Décroissant", "Croissant"], horizontal=True)
+    n_pages = max(1, -(-int(mask.sum()) // TABLE_PAGE_SIZE))
+    with col3:
+        page = st.number_input(f"Page (sur {n_pages})", min_value=1, max_value=n_pages, value=1)
+
+    # Seule la page affichée est extraite du tableau complet
+    df_page, total_rows = filter_index.page(mask, sort_col, sort_order == "Croissant", page, TABLE_PAGE_SIZE)
+    st.caption(f"{total_rows} joueur(s) correspondant(s)")
+    st.dataframe(df_page[display_cols], use_container_width=True, height=400)
+    # CSV construit seulement au clic sur le bouton
+    st.download_button("📥 Télécharger les données filtrées", 
+                      lambda: to_bytes(df[mask], export_format), 
+                      f'filtered_players{FILE_EXTENSIONS[export_format]}', MIME_TYPES[export_format])
+
+@st.fragment
+@profiled("joueur.recherche")
+def render_player_search(entry):
+    df = entry.df
+    st.markdown("## 🔍 Recherche de Joueur")
+    col1, col2 = st.columns([3,1])
+
+    with col1:
+        search_term = st.text_input("🔎 Rechercher un joueur", placeholder="Entrez le nom...", key="search")
+        search_field = st.radio("Rechercher par", list(SEARCH_FIELD_LABELS), horizontal=True, key="search_field")
+
+    search_index = entry.derived("search", PlayerSearchIndex)
+    player_rows, total_found = search_index.search(search_term, SEARCH_FIELD_LABELS[search_field], limit=SEARCH_LIMIT)
+
+    with col2:
+        st.markdown("### ")
+        st.info(f"📊 {total_found} résultat(s)")
+        if total_found > len(player_rows):
+            st.caption(f"{len(player_rows)} premiers affichés, affinez la recherche.")
+
+    if len(player_rows):
+        # Plusieurs saisons : un même joueur apparaît une fois par saison
+        if "Season" in df.columns:
+            label = lambda row: (f"{df['Player'].iat[row]} ({df['Season'].iat[row]})" if pd.notna(df['Season'].iat[row])
+                                 else df['Player'].iat[row])
+        else:
+            label = lambda row: df['Player'].iat[row]
+        player_row = st.selectbox("Sélectionnez un joueur", player_rows.tolist(), format_func=label)
+        if player_row is not None:
+            render_player(entry, player_row)
+    else:
+        st.warning("⚠️ Aucun joueur trouvé.")
+
+@profiled("joueur.fiche")
+def render_player(entry, player_row):
+    df = entry.df
+    selected_player = df['Player'].iat[player_row]
+    with profiler.section("joueur.index_classement"):
+        rank_index = entry.derived("ranks", RankIndex)
+    p = df.iloc[player_row]
+
+    with profiler.section("joueur.percentiles"):
+        player_pct = entry.derived("percentiles", PercentileIndex).percentiles(player_row)
+    cohort = f"{p['Pos']} · {p['Comp']}"
+
+    def percentile_label(column):
+        value = player_pct.get(column, np.nan)
+        return "" if np.isnan(value) else f"  ·  percentile {int(value)}"
+
+    st.markdown(f"---\n## 👤 {selected_player}")
+
+    # Métriques principales
+    cols = st.columns(4)
+    metrics = [
+        ('🏟️ Club', p['Squad']),
+        ('🏆 Championnat', p['Comp']),
+        ('📍 Position', p['Pos']),
+        ('🎂 Âge', int(p['Age']))
+    ]
+    for col, (label, value) in zip(cols, metrics):
+        col.metric(label, value)
+
+    st.markdown("---")
+
+    # Stats clés
+    cols = st.columns(4)
+    stats = [
+        ('⚽ Buts', int(p['Gls'])),
+        ('🎯 Assists', int(p['Ast'])),
+        ('🎮 Matchs Joués', int(p['MP'])),
+        ('⏱️ Minutes', int(p['Min']))
+    ]
+    for col, (label, value) in zip(cols, stats):
+        col.metric(label, value)
+
+    st.markdown("---")
+
+    # Expected stats et Progression
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("### ⚽ Statistiques Offensives")
+        offensive = {
+            'Buts': 'Gls',
+            'Assists': 'Ast',
+            'Buts + Assists': 'G+A',
+            'Buts hors penalty': 'G-PK',
+            'Penaltys marqués': 'PK',
+            'Penaltys tentés': 'PKatt',
+            'Expected Goals (xG)': 'xG',
+            'npxG': 'npxG',
+            'xAG': 'xAG',
+            'npxG+xAG': 'npxG+xAG'
+        }
+        for stat, column in offensive.items():
+            value = p[column]
+            text = f"{stat}: {value:.2f}" if isinstance(value, (float, np.floating)) else f"{stat}: {int(value)}"
+            st.text(text + percentile_label(column))
+
+    with col2:
+        st.markdown("### 🏃 Progression")
+        progression = {
+            'Passes progressives (PrgP)': 'PrgP',
+            'Courses progressives (PrgC)': 'PrgC',
+            'Réceptions progressives (PrgR)': 'PrgR'
+        }
+        for stat, column in progression.items():
+            st.text(f"{stat}: {p[column]:.0f}" + percentile_label(column))
+
+    # Cartons
+    st.markdown("---")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("### 🟨🟥 Discipline")
+        started = time.perf_counter()
+        cards_df = pd.DataFrame({
+            'Type': ['Cartons Jaunes', 'Cartons Rouges'], 
+            'Nombre': [int(p['CrdY']), int(p['CrdR'])]
+        })
+        fig = px.bar(cards_df, x='Type', y='Nombre', color='Type', 
+                    color_discrete_map={'Cartons Jaunes':'#FFD700', 'Cartons Rouges':'#FF0000'}, 
+                    text='Nombre')
+        fig.update_traces(textposition='outside')
+        fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', 
+                         font_color='white', showlegend=False, height=300)
+        show_chart('cartons', fig, started)
+
+    with col2:
+        st.markdown("### 📊 Minutes jouées")
+        started = time.perf_counter()
+        mins_data = pd.DataFrame({
+            'Catégorie': ['Minutes totales', 'Matchs démarrés', 'Matchs joués'],
+            'Valeur': [int(p['Min']), int(p['Starts']), int(p['MP'])]
+        })
+        fig = px.bar(mins_data, x='Catégorie', y='Valeur', color='Catégorie',
+                    color_discrete_sequence=['#667eea', '#764ba2', '#f093fb'], text='Valeur')
+        fig.update_traces(textposition='outside')
+        fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', 
+                         font_color='white', showlegend=False, height=300)
+        show_chart('minutes', fig, started)
+
+    st.markdown("---")
+
+    # Radar chart et Stats /90
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("### 📈 Radar des Performances")
+        started = time.perf_counter()
+        categories = ['Buts/90', 'Assists/90', 'xG/90', 'xAG/90', 'G+A/90']
+        radar_cols = ['Gls_90', 'Ast_90', 'xG_90', 'xAG_90', 'G+A_90']
+        # Percentiles dans la cohorte poste × championnat : 50 = joueur médian
+        player_vals = player_pct.reindex(radar_cols).fillna(0).tolist()
+
+        fig = go.Figure()
+        fig.add_trace(go.Scatterpolar(r=player_vals, theta=categories, fill='toself', 
+                                      name=selected_player, line_color='#667eea'))
+        fig.add_trace(go.Scatterpolar(r=[50] * len(categories), theta=categories, fill='toself', 
+                                      name=f'Médiane {cohort}', line_color='#f093fb'))
+        fig.update_layout(
+            polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
+            plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', 
+            font_color='white', height=400
+        )
+        show_chart('radar', fig, started)
+        st.caption(f"Percentiles parmi les {cohort} (au moins {MIN_MINUTES} minutes jouées)")
+
+    with col2:
+        st.markdown("### ⚖️ Stats /90 min")
+        started = time.perf_counter()
+        stats_90 = {
+            'Buts': p['Gls_90'],
+            'Assists': p['Ast_90'],
+            'G+A': p['G+A_90'],
+            'xG': p['xG_90'],
+            'xAG': p['xAG_90']
+        }
+        stats_df = pd.DataFrame(list(stats_90.items()), columns=['Stat', 'Valeur'])
+        fig = px.bar(stats_df, x='Stat', y='Valeur', color='Valeur', 
+                    color_continuous_scale='Purples', text='Valeur')
+        fig.update_traces(texttemplate='%{text:.2f}', textposition='outside')
+        fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', 
+                         font_color='white', showlegend=False, height=400)
+        show_chart('stats_90', fig, started)
+
+    # Percentiles de toutes les statistiques
+    st.markdown(f"---\n### 📊 Percentiles ({cohort})")
+    pct_df = pd.DataFrame({'Stat': player_pct.index, 'Valeur': p[player_pct.index].to_numpy(dtype=float),
+                           'Percentile': player_pct.to_numpy()})
+    st.dataframe(pct_df, use_container_width=True, hide_index=True,
+                 column_config={'Valeur': st.column_config.NumberColumn(format="%.2f"),
+                                'Percentile': st.column_config.ProgressColumn(min_value=0, max_value=100, format="%d")})
+
+    # Comparaison position
+    st.markdown("---\n### 🎯 Comparaison par Position")
+    # Seules les colonnes tracées sont copiées
+    started = time.perf_counter()
+    same_pos_comp = df.loc[df['Pos'] == p['Pos'], ['Player', 'Squad', 'Gls_90', 'Ast_90', 'G+A']].copy()
+    same_pos_comp['is_selected'] = same_pos_comp['Player'] == selected_player
+    fig = create_plot(same_pos_comp, 'scatter', keep=same_pos_comp['is_selected'].to_numpy(),
+                     x='Gls_90', y='Ast_90', size='G+A', color='is_selected',
+                     color_discrete_map={True:'#00ff87', False:'#667eea'},
+                     hover_data=['Player', 'Squad'],
+                     title=f'Comparaison des {p["Pos"]} (Buts/90 vs Assists/90)')
+    fig.update_layout(height=500)
+    show_chart('comparaison_poste', fig, started)
+    if len(same_pos_comp) > MAX_SCATTER_POINTS:
+        st.caption(f"Échantillon de {MAX_SCATTER_POINTS:,} joueurs sur {len(same_pos_comp):,} "
+                   "(zones denses allégées, joueur sélectionné et valeurs extrêmes conservés)")
+
+    # Classements
+    st.markdown("---")
+    cols = st.columns(3)
+    rankings = [
+        ('Gls', '⚽ Classement Buts'),
+        ('Ast', '🎯 Classement Assists'),
+        ('G+A', '🔥 Classement G+A')
+    ]
+    with profiler.section("joueur.classements"):
+        for col, (field, label) in zip(cols, rankings):
+            player_rank, total = rank_index.rank(player_row, field)
+            col.metric(label, f"#{player_rank}/{total}" if player_rank else "-")
+
+    # Joueurs similaires
+    st.markdown("---\n## 🔍 Joueurs Similaires")
+    with profiler.section("joueur.similaires"):
+        similar = entry.derived("similarity", SimilarityIndex).similar(player_row, k=5)
+
+    if len(similar) > 0:
+        similar.columns = ['Joueur', 'Club', 'Championnat', 'Score de Similarité']
+        similar['Score de Similarité'] = similar['Score de Similarité'].round(3)
+        st.dataframe(similar, use_container_width=True, hide_index=True)
+    else:
+        st.info("Aucun joueur similaire trouvé à cette position.")
+
+@st.fragment
+@profiled("sql.requete")
+def render_sql_panel(entry):
+    st.markdown("## 🧮 Requêtes SQL")
+    if not has_duckdb():
+        st.info("Les requêtes SQL nécessitent DuckDB : `pip install duckdb`.")
+        return
+    engine = entry.derived("sql", SqlEngine)
+    st.caption(f"Table `{engine.table}` : une requête de lecture à la fois, résultats limités à {MAX_RESULT_ROWS:,} lignes. "
+               'Colonnes à caractères spéciaux entre guillemets : `"G+A"`.')
+
+    example = st.selectbox("Exemple", ["—"] + list(EXAMPLE_QUERIES), key="sql_example")
+    if example != "—" and st.session_state.get("sql_loaded_example") != example:
+        st.session_state["sql_query"] = EXAMPLE_QUERIES[example]
+        st.session_state["sql_loaded_example"] = example
+    sql = st.text_area("Requête", key="sql_query", height=180,
+                       placeholder="SELECT Comp, AVG(Age) FROM players GROUP BY Comp")
+    with st.expander("Colonnes disponibles"):
+        st.dataframe(engine.columns(), use_container_width=True, hide_index=True)
+
+    if st.button("▶️ Exécuter", key="sql_run") and sql.strip():
+        try:
+            result = engine.query(sql)
+        except Exception as e:
+            st.error(f"❌ {e}")
+            return
+        st.caption(f"{len(result)} ligne(s) en {result.attrs['seconds'] * 1000:.0f} ms"
+                   + (" (résultat tronqué)" if result.attrs["truncated"] else ""))
+        st.dataframe(result, use_container_width=True, hide_index=True)
+
 # Sidebar
 with st.sidebar:
     st.image("https://img.icons8.com/color/96/000000/football2--v1.png", width=100)
     st.markdown("## 📁 Chargement des données")
-    uploaded_file = st.file_uploader("Choisir un fichier CSV", type=["csv"])
+    uploaded_files = st.file_uploader("Choisir des fichiers CSV, Parquet ou Arrow (une saison ou un championnat par fichier)",
+                                      type=accepted_extensions(), accept_multiple_files=True)
     
     df = None
-    if uploaded_file:
+    entry = None
+    if uploaded_files:
+        try:
+            with profiler.section("nettoyage"):
+                entry = wait_for_cleaning([(f.name, f.getvalue()) for f in uploaded_files])
+        except Exception as e:
+            st.error(f"❌ Erreur : {str(e)}")
+    else:
+        st.info("📤 Importez un fichier CSV pour commencer.")
+
+    if entry is not None:
         try:
-            df_original = pd.read_csv(uploaded_file)
-            st.markdown("### 📊 Fichier Original")
-            st.info(f"**Lignes:** {len(df_original)}\n\n**Colonnes:** {len(df_original.columns)}")
+            original_rows, original_cols = entry.original_shape
+            st.markdown("### 📊 Fichier Original" if len(uploaded_files) == 1 else "### 📊 Fichiers Originaux")
+            st.info(f"**Lignes:** {original_rows}\n\n**Colonnes:** {original_cols}")
+            files = entry.df.attrs.get("files") or []
+            if len(files) > 1:
+                st.dataframe(pd.DataFrame(files), hide_index=True, use_container_width=True)
             
-            with st.spinner("🧹 Nettoyage en cours..."):
-                df = clean_dataframe(df_original)
-                for msg in (df.attrs.get("errors") or []):
-                    st.warning(msg)
+            df = entry.df
+            for msg in (df.attrs.get("errors") or []):
+                st.warning(msg)
             
             st.success("✅ Nettoyage terminé!")
             
             st.markdown("### ✨ Fichier Nettoyé")
-            rows_removed = len(df_original) - len(df)
+            rows_removed = original_rows - len(df)
             st.metric("Lignes supprimées", rows_removed)
             st.metric("Lignes restantes", len(df))
+            if "memory" in df.attrs:
+                st.caption(f"Mémoire : {df.attrs['memory']['after'] / 1e6:.1f} Mo "
+                           f"({df.attrs['memory']['saved'] / 1e6:.1f} Mo économisés)")
             
-            st.download_button("📥 Télécharger le CSV nettoyé", df.to_csv(index=False).encode("utf-8"), 
-                             "cleaned_players.csv", "text/csv")
+            # Parquet / Arrow conservent les types nettoyés (catégories, entiers réduits, float32)
+            export_format = st.radio("Format d'export", available_formats(), horizontal=True,
+                                     format_func=str.upper, key="export_format")
+            st.download_button("📥 Télécharger le fichier nettoyé", lambda: entry.export(export_format), 
+                             f"cleaned_players{FILE_EXTENSIONS[export_format]}", MIME_TYPES[export_format])
             
             st.markdown("---")
             
             with st.expander("🔍 Détails du nettoyage"):
-                st.markdown(f"""
-                - ✅ Doublons supprimés
-                - ✅ Lignes vides supprimées
-                - ✅ Valeurs manquantes traitées
-                - ✅ Colonnes numériques converties
-                - ✅ Textes nettoyés
-                
-                **Résultat:** {rows_removed} ligne(s) supprimée(s)
-                """)
+                stages = df.attrs.get("stages") or []
+                if stages:
+                    st.dataframe(pd.DataFrame([{
+                        'Étape': STAGE_LABELS.get(r['stage'], r['stage']),
+                        'Durée (ms)': round(r['seconds'] * 1000, 1),
+                        'Lignes entrée': r['rows_in'],
+                        'Lignes sortie': r['rows_out'],
+                        'Colonnes modifiées': len(r['columns_changed']),
+                        'Pic mémoire (Mo)': None if r['peak_memory_delta'] is None else round(r['peak_memory_delta'] / 1e6, 1),
+                    } for r in stages]), use_container_width=True, hide_index=True)
+                    st.caption(f"Durée totale : {sum(r['seconds'] for r in stages) * 1000:.0f} ms")
+                st.markdown(f"**Résultat:** {rows_removed} ligne(s) supprimée(s)")
                 
         except Exception as e:
             st.error(f"❌ Erreur : {str(e)}")
             df = None
-    else:
-        st.info("📤 Importez un fichier CSV pour commencer.")
     
     st.markdown("---\n### 📊 À propos")
     st.info("Dashboard d'analyse des performances des joueurs de football.")
@@ -81,271 +573,23 @@ if df is not None and len(df) > 0:
         # Message temporaire au lieu de la barre verte persistante
         st.toast(f"✅ {len(df)} joueurs chargés avec succès!", icon="⚽")
         
-        tab1, tab2 = st.tabs(["🌍 Vue Globale", "👤 Analyse Joueur"])
+        tab1, tab2, tab3 = st.tabs(["🌍 Vue Globale", "👤 Analyse Joueur", "🧮 Requêtes SQL"],
+                                   key="main_tab", on_change="rerun")
         
-        with tab1:
-            # TOP 10 BUTEURS
-            st.markdown("### ⚽ Top 10 Buteurs")
-            top_scorers = df.nlargest(10, 'Gls')[['Player','Gls','Squad','Comp']]
-            fig_scorers = create_plot(top_scorers, 'bar', x='Gls', y='Player', orientation='h', color='Gls', 
-                             color_continuous_scale='Reds', text='Gls', hover_data=['Squad','Comp'])
-            fig_scorers.update_traces(textposition='outside')
-            fig_scorers.update_layout(height=400)
-            st.plotly_chart(fig_scorers, use_container_width=True)
-            
-            st.markdown("---")
-            
-            # TOP 10 PASSEURS
-            st.markdown("### 🎯 Top 10 Passeurs")
-            top_assist = df.nlargest(10, 'Ast')[['Player','Ast','Squad','Comp']]
-            fig_assist = create_plot(top_assist, 'bar', x='Ast', y='Player', orientation='h', color='Ast', 
-                             color_continuous_scale='Greens', text='Ast', hover_data=['Squad','Comp'])
-            fig_assist.update_traces(textposition='outside')
-            fig_assist.update_layout(height=400)
-            st.plotly_chart(fig_assist, use_container_width=True)
-            
-            # Analyse par championnat
-            st.markdown("---\n## 🏆 Analyse par Championnat")
-            competitions = ['Tous'] + sorted(df['Comp'].unique().tolist())
-            selected_comp = st.selectbox("Sélectionnez un championnat", competitions)
-            df_filtered = df if selected_comp == 'Tous' else df[df['Comp'] == selected_comp]
-            
-            # Distributions
-            col1, col2, col3 = st.columns(3)
-            charts = [
-                (col1, 'Gls', 'Buts', '#667eea'),
-                (col2, 'Ast', 'Assists', '#764ba2'),
-                (col3, 'MP', 'Matchs Joués', '#f093fb')
-            ]
-            
-            for col, field, title, color in charts:
-                with col:
-                    fig = create_plot(df_filtered, 'histogram', x=field, nbins=30, 
-                                     title=f'Distribution des {title}', 
-                                     color_discrete_sequence=[color])
-                    st.plotly_chart(fig, use_container_width=True)
-            
-            # Tableau filtrable
-            st.markdown("---\n## 📊 Tableau des Joueurs")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                pos_filter = st.multiselect("Position", df['Pos'].unique())
-            with col2:
-                comp_filter = st.multiselect("Championnat", df['Comp'].unique())
-            with col3:
-                min_goals = st.slider("Buts minimum", 0, int(df['Gls'].max()), 0)
-            
-            df_table = df.copy()
-            if pos_filter:
-                df_table = df_table[df_table['Pos'].isin(pos_filter)]
-            if comp_filter:
-                df_table = df_table[df_table['Comp'].isin(comp_filter)]
-            df_table = df_table[df_table['Gls'] >= min_goals]
-            
-            display_cols = ['Player','Pos','Squad','Comp','Age','MP','Gls','Ast','G+A','xG','Min']
-            st.dataframe(df_table[display_cols].sort_values('Gls', ascending=False), use_container_width=True, height=400)
-            st.download_button("📥 Télécharger les données filtrées", df_table.to_csv(index=False).encode('utf-8'), 
-                              'filtered_players.csv', 'text/csv')
+        # Seul l'onglet affiché est calculé
+        if tab1.open:
+            with tab1:
+                render_top_players(df)
+                render_league_analysis(entry)
+                render_player_table(entry, export_format)
         
-        with tab2:
-            st.markdown("## 🔍 Recherche de Joueur")
-            col1, col2 = st.columns([3,1])
-            
-            with col1:
-                search_term = st.text_input("🔎 Rechercher un joueur", placeholder="Entrez le nom...", key="search")
-            
-            if search_term:
-                player_list = df[df['Player'].str.contains(search_term, case=False, na=False)]['Player'].tolist()
-            else:
-                player_list = df['Player'].tolist()
-            
-            with col2:
-                st.markdown("### ")
-                st.info(f"📊 {len(player_list)} résultat(s)")
-            
-            if player_list:
-                selected_player = st.selectbox("Sélectionnez un joueur", sorted(player_list))
-                
-                if selected_player:
-                    p = df[df['Player'] == selected_player].iloc[0]
-                    
-                    st.markdown(f"---\n## 👤 {selected_player}")
-                    
-                    # Métriques principales
-                    cols = st.columns(4)
-                    metrics = [
-                        ('🏟️ Club', p['Squad']),
-                        ('🏆 Championnat', p['Comp']),
-                        ('📍 Position', p['Pos']),
-                        ('🎂 Âge', int(p['Age']))
-                    ]
-                    for col, (label, value) in zip(cols, metrics):
-                        col.metric(label, value)
-                    
-                    st.markdown("---")
-                    
-                    # Stats clés
-                    cols = st.columns(4)
-                    stats = [
-                        ('⚽ Buts', int(p['Gls'])),
-                        ('🎯 Assists', int(p['Ast'])),
-                        ('🎮 Matchs Joués', int(p['MP'])),
-                        ('⏱️ Minutes', int(p['Min']))
-                    ]
-                    for col, (label, value) in zip(cols, stats):
-                        col.metric(label, value)
-                    
-                    st.markdown("---")
-                    
-                    # Expected stats et Progression
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.markdown("### ⚽ Statistiques Offensives")
-                        offensive = {
-                            'Buts': p['Gls'],
-                            'Assists': p['Ast'],
-                            'Buts + Assists': p['G+A'],
-                            'Buts hors penalty': p['G-PK'],
-                            'Penaltys marqués': p['PK'],
-                            'Penaltys tentés': p['PKatt'],
-                            'Expected Goals (xG)': p['xG'],
-                            'npxG': p['npxG'],
-                            'xAG': p['xAG'],
-                            'npxG+xAG': p['npxG+xAG']
-                        }
-                        for stat, value in offensive.items():
-                            st.text(f"{stat}: {value:.2f}" if isinstance(value, float) else f"{stat}: {int(value)}")
-                    
-                    with col2:
-                        st.markdown("### 🏃 Progression")
-                        progression = {
-                            'Passes progressives (PrgP)': p['PrgP'],
-                            'Courses progressives (PrgC)': p['PrgC'],
-                            'Réceptions progressives (PrgR)': p['PrgR']
-                        }
-                        for stat, value in progression.items():
-                            st.text(f"{stat}: {value:.0f}")
-                    
-                    # Cartons
-                    st.markdown("---")
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.markdown("### 🟨🟥 Discipline")
-                        cards_df = pd.DataFrame({
-                            'Type': ['Cartons Jaunes', 'Cartons Rouges'], 
-                            'Nombre': [int(p['CrdY']), int(p['CrdR'])]
-                        })
-                        fig = px.bar(cards_df, x='Type', y='Nombre', color='Type', 
-                                    color_discrete_map={'Cartons Jaunes':'#FFD700', 'Cartons Rouges':'#FF0000'}, 
-                                    text='Nombre')
-                        fig.update_traces(textposition='outside')
-                        fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', 
-                                         font_color='white', showlegend=False, height=300)
-                        st.plotly_chart(fig, use_container_width=True)
-                    
-                    with col2:
-                        st.markdown("### 📊 Minutes jouées")
-                        mins_data = pd.DataFrame({
-                            'Catégorie': ['Minutes totales', 'Matchs démarrés', 'Matchs joués'],
-                            'Valeur': [int(p['Min']), int(p['Starts']), int(p['MP'])]
-                        })
-                        fig = px.bar(mins_data, x='Catégorie', y='Valeur', color='Catégorie',
-                                    color_discrete_sequence=['#667eea', '#764ba2', '#f093fb'], text='Valeur')
-                        fig.update_traces(textposition='outside')
-                        fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', 
-                                         font_color='white', showlegend=False, height=300)
-                        st.plotly_chart(fig, use_container_width=True)
-                    
-                    st.markdown("---")
-                    
-                    # Radar chart et Stats /90
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.markdown("### 📈 Radar des Performances")
-                        same_pos = df[df['Pos'] == p['Pos']]
-                        categories = ['Buts/90', 'Assists/90', 'xG/90', 'xAG/90', 'G+A/90']
-                        player_vals = [p['Gls_90'], p['Ast_90'], p['xG_90'], p['xAG_90'], p['G+A_90']]
-                        pos_avg = [same_pos['Gls_90'].mean(), same_pos['Ast_90'].mean(), 
-                                  same_pos['xG_90'].mean(), same_pos['xAG_90'].mean(), same_pos['G+A_90'].mean()]
-                        
-                        fig = go.Figure()
-                        fig.add_trace(go.Scatterpolar(r=player_vals, theta=categories, fill='toself', 
-                                                      name=selected_player, line_color='#667eea'))
-                        fig.add_trace(go.Scatterpolar(r=pos_avg, theta=categories, fill='toself', 
-                                                      name=f'Moy. {p["Pos"]}', line_color='#f093fb'))
-                        fig.update_layout(
-                            polar=dict(radialaxis=dict(visible=True, range=[0, max(max(player_vals), max(pos_avg))*1.1])),
-                            plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', 
-                            font_color='white', height=400
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
-                    
-                    with col2:
-                        st.markdown("### ⚖️ Stats /90 min")
-                        stats_90 = {
-                            'Buts': p['Gls_90'],
-                            'Assists': p['Ast_90'],
-                            'G+A': p['G+A_90'],
-                            'xG': p['xG_90'],
-                            'xAG': p['xAG_90']
-                        }
-                        stats_df = pd.DataFrame(list(stats_90.items()), columns=['Stat', 'Valeur'])
-                        fig = px.bar(stats_df, x='Stat', y='Valeur', color='Valeur', 
-                                    color_continuous_scale='Purples', text='Valeur')
-                        fig.update_traces(texttemplate='%{text:.2f}', textposition='outside')
-                        fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', 
-                                         font_color='white', showlegend=False, height=400)
-                        st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Comparaison position
-                    st.markdown("---\n### 🎯 Comparaison par Position")
-                    same_pos_comp = same_pos.copy()
-                    same_pos_comp['is_selected'] = same_pos_comp['Player'] == selected_player
-                    fig = px.scatter(same_pos_comp, x='Gls_90', y='Ast_90', size='G+A', color='is_selected',
-                                    color_discrete_map={True:'#00ff87', False:'#667eea'}, 
-                                    hover_data=['Player', 'Squad'],
-                                    title=f'Comparaison des {p["Pos"]} (Buts/90 vs Assists/90)')
-                    fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', 
-                                     font_color='white', showlegend=False, height=500)
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Classements
-                    st.markdown("---")
-                    cols = st.columns(3)
-                    rankings = [
-                        ('Gls', '⚽ Classement Buts'),
-                        ('Ast', '🎯 Classement Assists'),
-                        ('G+A', '🔥 Classement G+A')
-                    ]
-                    for col, (field, label) in zip(cols, rankings):
-                        rank = df.sort_values(field, ascending=False).reset_index(drop=True)
-                        player_rank = rank[rank['Player'] == selected_player].index[0] + 1
-                        col.metric(label, f"#{player_rank}/{len(df)}")
-                    
-                    # Joueurs similaires
-                    st.markdown("---\n## 🔍 Joueurs Similaires")
-                    same_pos_sim = df[(df['Pos'] == p['Pos']) & (df['Player'] != selected_player)].copy()
-                    
-                    if len(same_pos_sim) > 0:
-                        features = ['Gls_90', 'Ast_90', 'xG_90', 'xAG_90']
-                        
-                        scaler = StandardScaler()
-                        scaled = scaler.fit_transform(same_pos_sim[features])
-                        player_feat = scaler.transform([[p[f] for f in features]])
-                        similarities = cosine_similarity(player_feat, scaled)[0]
-                        
-                        same_pos_sim['similarity'] = similarities
-                        similar = same_pos_sim.nlargest(min(5, len(same_pos_sim)), 'similarity')[['Player', 'Squad', 'Comp', 'similarity']]
-                        similar.columns = ['Joueur', 'Club', 'Championnat', 'Score de Similarité']
-                        similar['Score de Similarité'] = similar['Score de Similarité'].round(3)
-                        st.dataframe(similar, use_container_width=True, hide_index=True)
-                    else:
-                        st.info("Aucun joueur similaire trouvé à cette position.")
-            else:
-                st.warning("⚠️ Aucun joueur trouvé.")
+        if tab2.open:
+            with tab2:
+                render_player_search(entry)
+
+        if tab3.open:
+            with tab3:
+                render_sql_panel(entry)
     
     except Exception as e:
         st.error(f"❌ Erreur lors de l'analyse : {str(e)}")
@@ -407,5 +651,20 @@ else:
             - Nettoyage automatique
             """)
 
+# Mode profilage : mesures de cette exécution, puis percentiles sur l'ensemble du journal
+if profiler.enabled:
+    profiler.finish()
+    with st.expander("⏱️ Profilage de l'exécution", expanded=False):
+        measures = profiler.to_frame()
+        measures['ms'] = (measures.pop('seconds') * 1000).round(1)
+        measures['sérialisation (ms)'] = (measures.pop('serialize_seconds') * 1000).round(1)
+        measures['taille (Ko)'] = (measures.pop('bytes') / 1000).round(1)
+        st.dataframe(measures, use_container_width=True, hide_index=True)
+        history = summarize_log(profiler.path)
+        if len(history):
+            st.markdown("**Toutes les sessions (secondes)**")
+            st.dataframe(history, use_container_width=True, hide_index=True)
+        st.caption(f"Journal : `{profiler.path}`")
+
 st.markdown("---")
 st.markdown("<div style='text-align:center;color:#666;padding:20px'><p>⚽ Football Analytics Dashboard | Fait avec ❤️ en utilisant Streamlit et Plotly</p><p>🧹 Inclut un système de nettoyage automatique des données</p></div>", unsafe_allow_html=True)
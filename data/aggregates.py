@@ -0,0 +1,182 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+GROUP_COLS = ("Pos", "Comp")
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+N_BINS = 30
+
+
+def bin_edges(values: np.ndarray, bins: int) -> np.ndarray:
+    # Bornes fixes par colonne ; pas entier centré sur les valeurs pour les colonnes entières
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return np.linspace(0.0, 1.0, bins + 1)
+    lo, hi = float(values.min()), float(values.max())
+    if np.all(values == np.round(values)):
+        step = max(1, int(np.ceil((hi - lo + 1) / bins)))
+        return lo - 0.5 + step * np.arange(int((hi - lo) // step) + 2)
+    if hi == lo:
+        hi = lo + 1
+    return np.linspace(lo, hi, bins + 1)
+
+
+class AggregateCube:
+    # Statistiques Pos × Comp × colonne numérique (et leurs marges), calculées une fois par jeu de données
+    def __init__(self, df: pd.DataFrame, columns: list[str] | None = None, group_cols=GROUP_COLS,
+                 quantiles=QUANTILES, bins: int = N_BINS):
+        self.df = df
+        self.group_cols = [c for c in group_cols if c in df.columns]
+        self.columns = columns or df.select_dtypes(include="number").columns.tolist()
+        self.quantiles = tuple(quantiles)
+        self.bins = bins
+        # Cube complet puis marges : (Pos, Comp), (Pos,), (Comp,), ()
+        self.levels = [level for r in range(len(self.group_cols), -1, -1)
+                       for level in combinations(self.group_cols, r)]
+        self._stats = {level: self._compute(df, level) for level in self.levels}
+        self._stale = {level: set() for level in self.levels}
+
+        self._cells = []
+        self._cell_ids = {}
+        self._hist = {}
+        self.edges = {}
+        ids = self._assign_cells(df)
+        for c in self.columns:
+            self._rebuild_histogram(c, ids)
+
+# ------------------| Statistiques par groupe |------------------
+    def _compute(self, df: pd.DataFrame, level: tuple, quantiles: bool = True) -> dict:
+        values = df[self.columns]
+        if level:
+            grouped = values.groupby([df[c] for c in level], observed=True)
+            stats = {"count": grouped.count(), "sum": grouped.sum()}
+            if quantiles:
+                q = grouped.quantile(list(self.quantiles))
+                for x in self.quantiles:
+                    stats[x] = q.xs(x, level=-1)
+        else:
+            stats = {"count": values.count().to_frame().T, "sum": values.sum().to_frame().T}
+            if quantiles:
+                q = values.quantile(list(self.quantiles))
+                for x in self.quantiles:
+                    stats[x] = q.loc[[x]].reset_index(drop=True)
+        stats["count"] = stats["count"].astype(np.int64)
+        stats["sum"] = stats["sum"].astype(np.float64)
+        stats["mean"] = stats["sum"] / stats["count"]
+        return stats
+
+    def _level(self, groups: dict) -> tuple[tuple, object]:
+        unknown = set(groups) - set(self.group_cols)
+        if unknown:
+            raise KeyError(f"Colonne de regroupement inconnue : {', '.join(sorted(unknown))}")
+        level = tuple(c for c in self.group_cols if c in groups)
+        key = tuple(groups[c] for c in level)
+        return level, (key[0] if len(key) == 1 else key) if key else 0
+
+    def stat(self, name, columns, **groups) -> pd.Series:
+        # name : "count", "sum", "mean" ou un quantile de QUANTILES (0.5 pour la médiane)
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        level, key = self._level(groups)
+        if key in self._stale[level] and name in self.quantiles:
+            self._refresh(level, key)
+        frame = self._stats[level][name]
+        if key not in frame.index:
+            return pd.Series(0 if name in ("count", "sum") else np.nan, index=columns, dtype=np.float64)
+        return frame.loc[key, columns]
+
+    def _refresh(self, level: tuple, key) -> None:
+        mask = np.ones(len(self.df), dtype=bool)
+        for c, value in zip(level, key if len(level) > 1 else (key,)):
+            mask &= (self.df[c] == value).to_numpy()
+        q = self.df.loc[mask, self.columns].quantile(list(self.quantiles))
+        for x in self.quantiles:
+            self._stats[level][x].loc[key] = q.loc[x]
+        self._stale[level].discard(key)
+
+    def mean(self, columns, **groups) -> pd.Series:
+        return self.stat("mean", columns, **groups)
+
+    def median(self, columns, **groups) -> pd.Series:
+        return self.stat(0.5, columns, **groups)
+
+    def count(self, columns, **groups) -> pd.Series:
+        return self.stat("count", columns, **groups)
+
+# ------------------| Histogrammes pré-calculés |------------------
+    def _assign_cells(self, df: pd.DataFrame) -> np.ndarray:
+        # Identifiant de cellule Pos × Comp de chaque ligne (les clés manquantes forment leur propre cellule)
+        if not self.group_cols:
+            if not self._cells:
+                self._cells.append(())
+                self._cell_ids[()] = 0
+            return np.zeros(len(df), dtype=np.int64)
+        grouped = df.groupby(self.group_cols, observed=True, dropna=False, sort=False)
+        local = grouped.ngroup().to_numpy()
+        mapping = np.empty(grouped.ngroups, dtype=np.int64)
+        for i, key in enumerate(grouped.size().index):
+            key = tuple(None if pd.isna(k) else k for k in (key if isinstance(key, tuple) else (key,)))
+            if key not in self._cell_ids:
+                self._cell_ids[key] = len(self._cells)
+                self._cells.append(key)
+            mapping[i] = self._cell_ids[key]
+        return mapping[local]
+
+    def _bin(self, column: str, values: np.ndarray, ids: np.ndarray) -> np.ndarray:
+        edges = self.edges[column]
+        n = len(edges) - 1
+        b = np.searchsorted(edges, values, side="right") - 1
+        b[values == edges[-1]] = n - 1
+        valid = ~np.isnan(values) & (b >= 0) & (b < n)
+        counts = np.bincount(ids[valid] * n + b[valid], minlength=len(self._cells) * n)
+        return counts.reshape(len(self._cells), n)
+
+    def _rebuild_histogram(self, column: str, ids: np.ndarray) -> None:
+        values = self.df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.edges[column] = bin_edges(values, self.bins)
+        self._hist[column] = self._bin(column, values, ids)
+
+    def histogram(self, column: str, **groups) -> tuple[np.ndarray, np.ndarray]:
+        # Comptes par intervalle et bornes, sommés sur les cellules correspondant aux filtres
+        level, _ = self._level(groups)
+        hist = self._hist[column]
+        if level:
+            positions = [self.group_cols.index(c) for c in level]
+            rows = [i for i, cell in enumerate(self._cells)
+                    if all(cell[j] == groups[c] for j, c in zip(positions, level))]
+            hist = hist[rows]
+        return hist.sum(axis=0), self.edges[column]
+
+# ------------------| Mise à jour incrémentale |------------------
+    def add(self, rows: pd.DataFrame) -> "AggregateCube":
+        # Nouvelles lignes : comptes, sommes et histogrammes mis à jour sans relire le tableau complet
+        if not len(rows):
+            return self
+        self.df = pd.concat([self.df, rows], ignore_index=True)
+
+        for level in self.levels:
+            stats = self._stats[level]
+            delta = self._compute(rows, level, quantiles=False)
+            for name in ("count", "sum"):
+                stats[name] = stats[name].add(delta[name], fill_value=0).astype(stats[name].dtypes.iloc[0])
+            stats["mean"] = stats["sum"] / stats["count"]
+
+            # Quantiles des groupes touchés : recalculés à la première lecture
+            for x in self.quantiles:
+                stats[x] = stats[x].reindex(stats["count"].index)
+            self._stale[level].update(delta["count"].index if level else [0])
+
+        n_before = len(self._cells)
+        ids = self._assign_cells(rows)
+        for c in self.columns:
+            values = rows[c].to_numpy(dtype=np.float64, na_value=np.nan)
+            edges = self.edges[c]
+            if np.nanmin(values, initial=edges[0]) < edges[0] or np.nanmax(values, initial=edges[-1]) > edges[-1]:
+                # Valeurs hors des bornes : l'histogramme de la colonne est reconstruit
+                self._rebuild_histogram(c, self._assign_cells(self.df))
+                continue
+            hist = self._hist[c]
+            if len(self._cells) > n_before:
+                hist = np.vstack([hist, np.zeros((len(self._cells) - n_before, hist.shape[1]), dtype=hist.dtype)])
+            self._hist[c] = hist + self._bin(c, values, ids)
+        return self
@@ -0,0 +1,212 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from data.cache import CACHE_VERSION
+from data.formats import EXTENSIONS, FILE_EXTENSIONS, read_table, write_table
+from data.verify_data import clean_dataframe
+
+logger = logging.getLogger("soccer_stats.batch")
+
+MANIFEST_NAME = ".clean_manifest.json"
+
+# Codes de sortie de la ligne de commande
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_NO_INPUT = 2
+
+
+def file_hash(path: str, block_size: int = 1 << 20) -> str:
+    # Empreinte SHA-256 lue par blocs : la mémoire ne dépend pas de la taille du fichier
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            h.update(block)
+    return h.hexdigest()
+
+
+# ------------------| Sélection des fichiers |------------------
+def _is_excluded(path: str, excluded: list[str]) -> bool:
+    return os.path.basename(path).startswith(".tmp-") or any(
+        path == e or path.startswith(e.rstrip(os.sep) + os.sep) for e in excluded)
+
+
+def expand_inputs(patterns: list[str], exclude: list[str] = ()) -> list[str]:
+    # Fichiers, dossiers (parcourus récursivement) et motifs glob ; chaque fichier une seule fois.
+    # Les sorties d'un lot précédent (`exclude` : dossier de sortie, manifeste) et ses fichiers temporaires sont ignorés
+    excluded = [os.path.abspath(e) for e in exclude if e]
+    found = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths = []
+            for root, dirs, names in os.walk(pattern):
+                dirs[:] = [d for d in dirs if not _is_excluded(os.path.abspath(os.path.join(root, d)), excluded)]
+                paths.extend(os.path.join(root, name) for name in names)
+            paths = [p for p in paths if os.path.splitext(p)[1].lower() in EXTENSIONS]
+        else:
+            paths = glob.glob(pattern, recursive=True) or ([pattern] if os.path.isfile(pattern) else [])
+        for path in sorted(paths):
+            path = os.path.abspath(path)
+            if os.path.isfile(path) and not _is_excluded(path, excluded):
+                found.setdefault(path, None)
+    return list(found)
+
+
+def pattern_root(pattern: str) -> str:
+    # Dossier fixe d'une entrée : le dossier donné, la partie sans joker d'un motif glob, ou le dossier du fichier
+    if os.path.isdir(pattern):
+        return os.path.abspath(pattern)
+    parts = pattern.split(os.sep)
+    fixed = []
+    for part in parts[:-1]:
+        if glob.has_magic(part):
+            break
+        fixed.append(part)
+    return os.path.abspath(os.sep.join(fixed) or (os.sep if pattern.startswith(os.sep) else "."))
+
+
+def output_paths(inputs: list[str], patterns: list[str], output_dir: str, fmt: str) -> dict[str, str]:
+    # Chemins relatifs au dossier commun des entrées données (pas des fichiers trouvés) : la sortie d'un fichier
+    # ne bouge pas quand l'arborescence s'enrichit, et deux fichiers homonymes ne s'écrasent pas
+    if not inputs:
+        return {}
+    base = os.path.commonpath([pattern_root(p) for p in patterns])
+    return {
+        p: os.path.join(output_dir, os.path.splitext(os.path.relpath(p, base))[0] + FILE_EXTENSIONS[fmt])
+        for p in inputs
+    }
+
+
+# ------------------| Nettoyage d'un fichier (exécuté dans un processus du pool) |------------------
+def clean_file(input_path: str, output_path: str, compact: bool = False,
+               memory_limit_mb: float | None = None) -> dict:
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    # Écriture dans un fichier temporaire puis renommage : jamais de sortie à moitié écrite
+    tmp_path = os.path.join(os.path.dirname(output_path), f".tmp-{os.getpid()}-{os.path.basename(output_path)}")
+    try:
+        if memory_limit_mb is not None:
+            from data.streaming import clean_csv_chunked
+
+            summary = clean_csv_chunked(input_path, tmp_path, memory_limit_mb=memory_limit_mb, verbose=False)
+            rows_in, rows_out, errors, stages = summary["rows_in"], summary["rows_out"], summary["errors"], []
+        else:
+            df_original = read_table(input_path)
+            df = clean_dataframe(df_original, compact=compact, memory=None, verbose=False)
+            write_table(df, tmp_path)
+            rows_in, rows_out = len(df_original), len(df)
+            errors = df.attrs.get("errors") or []
+            stages = [{"stage": r["stage"], "seconds": r["seconds"], "rows_out": r["rows_out"]}
+                      for r in df.attrs.get("stages") or []]
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return {
+        "rows_in": rows_in,
+        "rows_out": rows_out,
+        "errors": errors,
+        "stages": stages,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+# ------------------| Manifeste des fichiers déjà nettoyés |------------------
+def load_manifest(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path: str, manifest: dict) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def _is_unchanged(previous: dict | None, current: dict, input_path: str) -> tuple[bool, str | None]:
+    # Taille et date identiques : empreinte supposée identique ; sinon le contenu est relu
+    if previous is None or not os.path.exists(previous.get("output", "")):
+        return False, None
+    if any(previous.get(k) != current[k] for k in ("version", "format", "compact", "output")):
+        return False, None
+    if previous.get("size") == current["size"] and previous.get("mtime_ns") == current["mtime_ns"]:
+        return True, previous["hash"]
+    digest = file_hash(input_path)
+    return digest == previous.get("hash"), digest
+
+
+# ------------------| Exécution d'un lot |------------------
+def run_batch(patterns: list[str], output_dir: str, fmt: str = "csv", jobs: int | None = None,
+              force: bool = False, compact: bool = False, memory_limit_mb: float | None = None,
+              manifest_path: str | None = None, on_result=None) -> tuple[list[dict], int]:
+    manifest_path = manifest_path or os.path.join(output_dir, MANIFEST_NAME)
+    inputs = expand_inputs(patterns, exclude=[output_dir, manifest_path])
+    if not inputs:
+        logger.error("%s", json.dumps({"status": "no_input", "patterns": patterns}, ensure_ascii=False))
+        return [], EXIT_NO_INPUT
+
+    manifest = {} if force else load_manifest(manifest_path)
+    outputs = output_paths(inputs, patterns, output_dir, fmt)
+    results = []
+
+    def report(record: dict) -> None:
+        results.append(record)
+        logger.info("%s", json.dumps(record, ensure_ascii=False))
+        if on_result is not None:
+            on_result(record)
+
+    todo = {}
+    for path in inputs:
+        stat = os.stat(path)
+        current = {"output": os.path.abspath(outputs[path]), "format": fmt, "compact": compact,
+                   "version": CACHE_VERSION, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        unchanged, digest = (False, None) if force else _is_unchanged(manifest.get(path), current, path)
+        if unchanged:
+            manifest[path].update(current)
+            report({"file": path, "output": outputs[path], "status": "skipped", "reason": "empreinte inchangée"})
+            continue
+        current["hash"] = digest or file_hash(path)
+        todo[path] = current
+
+    def done(path: str, outcome: dict | None, error: Exception | None) -> None:
+        if error is not None:
+            manifest.pop(path, None)
+            report({"file": path, "output": outputs[path], "status": "failed",
+                    "error": f"{type(error).__name__}: {error}"})
+            return
+        manifest[path] = todo[path]
+        report({"file": path, "output": outputs[path], "status": "warning" if outcome["errors"] else "ok",
+                **outcome})
+
+    try:
+        workers = min(jobs or os.cpu_count() or 1, max(len(todo), 1))
+        if workers <= 1:
+            for path in todo:
+                try:
+                    done(path, clean_file(path, outputs[path], compact, memory_limit_mb), None)
+                except Exception as e:
+                    done(path, None, e)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(clean_file, path, outputs[path], compact, memory_limit_mb): path
+                           for path in todo}
+                for future in as_completed(futures):
+                    try:
+                        done(futures[future], future.result(), None)
+                    except Exception as e:
+                        done(futures[future], None, e)
+    finally:
+        # Même interrompu, le lot garde la trace des fichiers déjà nettoyés
+        os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+        save_manifest(manifest_path, manifest)
+
+    failed = any(r["status"] == "failed" for r in results)
+    return results, EXIT_FAILED if failed else EXIT_OK
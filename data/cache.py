@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from data.formats import read_table, to_bytes, write_table
+from data.ingest import load_files
+from data.jobs import CleaningJob
+
+# À incrémenter quand le nettoyage change : les fichiers persistés deviennent alors obsolètes
+CACHE_VERSION = 2
+
+
+def content_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+class CleanedEntry:
+    def __init__(self, df: pd.DataFrame, original_shape: tuple[int, int]):
+        self.df = df
+        self.original_shape = original_shape
+        self._exports = {}
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    def derived(self, name: str, build):
+        # Structures dérivées (index, agrégats...) construites une fois par jeu de données
+        if name not in self._derived:
+            value = build(self.df)
+            with self._lock:
+                self._derived.setdefault(name, value)
+        return self._derived[name]
+
+    def export(self, fmt: str = "csv") -> bytes:
+        # Sérialisé une seule fois par format, au premier téléchargement demandé
+        with self._lock:
+            if fmt not in self._exports:
+                self._exports[fmt] = to_bytes(self.df, fmt)
+            return self._exports[fmt]
+
+    @property
+    def csv_bytes(self) -> bytes:
+        return self.export("csv")
+
+
+class CleanedFrameCache:
+    # Cache LRU des CSV nettoyés, indexé par l'empreinte SHA-256 du contenu
+    def __init__(self, max_entries: int = 8, persist_dir: str | None = None, compact: bool = False):
+        self.max_entries = max_entries
+        self.persist_dir = persist_dir
+        self.compact = compact
+        self._entries = OrderedDict()
+        # Nettoyages en cours, par clé
+        self._jobs = {}
+        self._lock = threading.Lock()
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+
+    def get(self, raw: bytes) -> CleanedEntry:
+        return self.get_many([("upload.csv", raw)])
+
+    def get_many(self, files: list[tuple[str, bytes]]) -> CleanedEntry:
+        return self.start_many(files).get()
+
+    @staticmethod
+    def key(files: list[tuple[str, bytes]]) -> str:
+        # Plusieurs fichiers (saisons, championnats) : la clé dépend du contenu et du nom de chacun
+        if len(files) == 1:
+            return content_hash(files[0][1])
+        return content_hash("\n".join(f"{name}:{content_hash(raw)}" for name, raw in files).encode("utf-8"))
+
+    def start_many(self, files: list[tuple[str, bytes]]) -> CleaningJob:
+        # Nettoyage en arrière-plan ; des sessions qui envoient les mêmes fichiers partagent le même travail
+        key = self.key(files)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return CleaningJob(key, result=entry)
+            job = self._jobs.get(key)
+            if job is not None and not job.cancelling:
+                return job
+            job = CleaningJob(key, lambda on_progress, cancel: self._build(key, files, on_progress, cancel),
+                              on_finish=self._finish)
+            self._jobs[key] = job
+            return job
+
+    def _build(self, key: str, files: list[tuple[str, bytes]], on_progress, cancel) -> CleanedEntry:
+        entry = self._load(key)
+        if entry is None:
+            df, original_shape = load_files(files, compact=self.compact, on_progress=on_progress, cancel=cancel)
+            entry = CleanedEntry(df, original_shape)
+            self._save(key, entry)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def _finish(self, job: CleaningJob) -> None:
+        with self._lock:
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+# ------------------| Persistance sur disque (Arrow IPC, optionnelle) |------------------
+    def _paths(self, key: str) -> tuple[str, str]:
+        mode = "compact" if self.compact else "full"
+        base = os.path.join(self.persist_dir, f"v{CACHE_VERSION}-{mode}-{key}")
+        return base + ".arrow", base + ".json"
+
+    def _load(self, key: str) -> CleanedEntry | None:
+        if not self.persist_dir:
+            return None
+        data_path, meta_path = self._paths(key)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            # Projeté en mémoire : ouverture immédiate, pages partagées entre processus du dashboard
+            df = read_table(data_path)
+        except Exception:
+            return None
+        df.attrs["errors"] = meta.get("errors", [])
+        for attr in ("memory", "stages", "files"):
+            if attr in meta:
+                df.attrs[attr] = meta[attr]
+        return CleanedEntry(df, tuple(meta["original_shape"]))
+
+    def _save(self, key: str, entry: CleanedEntry) -> None:
+        if not self.persist_dir:
+            return
+        data_path, meta_path = self._paths(key)
+        try:
+            write_table(entry.df, data_path)
+        except Exception:
+            # pyarrow absent ou colonne non sérialisable : cache en mémoire uniquement
+            if os.path.exists(data_path):
+                os.remove(data_path)
+            return
+        meta = {"original_shape": list(entry.original_shape), "errors": entry.df.attrs.get("errors") or []}
+        for attr in ("memory", "stages", "files"):
+            if attr in entry.df.attrs:
+                meta[attr] = entry.df.attrs[attr]
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
@@ -0,0 +1,55 @@
+import numpy as np
+
+GRID_BINS = 64
+# Part du budget réservée aux points les plus excentrés
+OUTLIER_SHARE = 0.1
+
+
+def _robust_distance(values: np.ndarray) -> np.ndarray:
+    median = np.nanmedian(values)
+    spread = np.subtract(*np.nanpercentile(values, [75, 25])) or np.nanstd(values) or 1.0
+    return np.abs(values - median) / spread
+
+
+def downsample_points(x: np.ndarray, y: np.ndarray, max_points: int, keep: np.ndarray | None = None,
+                      bins: int = GRID_BINS, seed: int = 0) -> np.ndarray:
+    # Positions des points à afficher (au plus max_points, plus ceux de `keep`) :
+    # points imposés, points les plus excentrés, puis échantillon qui aplatit les zones denses
+    n = len(x)
+    if n <= max_points:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.isfinite(x) & np.isfinite(y)
+    kept = np.zeros(n, dtype=bool) if keep is None else np.asarray(keep, dtype=bool).copy()
+
+    n_outliers = min(int(max_points * OUTLIER_SHARE), int(valid.sum()))
+    if n_outliers:
+        distance = np.where(valid, np.maximum(_robust_distance(x), _robust_distance(y)), -np.inf)
+        kept[np.argpartition(distance, -n_outliers)[-n_outliers:]] = True
+
+    budget = max_points - int(kept.sum())
+    candidates = np.flatnonzero(valid & ~kept)
+    if budget > 0 and len(candidates):
+        # Grille bins × bins : chaque cellule reçoit au plus `quota` points, tirés au hasard
+        cx = np.clip(((x[candidates] - x[candidates].min()) / (np.ptp(x[candidates]) or 1) * bins).astype(int), 0, bins - 1)
+        cy = np.clip(((y[candidates] - y[candidates].min()) / (np.ptp(y[candidates]) or 1) * bins).astype(int), 0, bins - 1)
+        cells = cx * bins + cy
+        order = np.random.default_rng(seed).permutation(len(candidates))
+        order = order[np.argsort(cells[order], kind="stable")]
+        sorted_cells = cells[order]
+        counts = np.bincount(sorted_cells, minlength=bins * bins)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        rank = np.arange(len(order)) - starts[sorted_cells]
+
+        # Plus grand quota qui tient dans le budget
+        lo, hi = 0, int(counts.max())
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if np.minimum(counts, mid).sum() <= budget:
+                lo = mid
+            else:
+                hi = mid - 1
+        kept[candidates[order[rank < lo]]] = True
+
+    return np.flatnonzero(kept)
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+CATEGORY_FILTERS = ("Pos", "Comp")
+
+
+class FilterIndex:
+    # Filtres du tableau des joueurs sans copie : bitmaps par valeur et index triés par colonne
+    def __init__(self, df: pd.DataFrame, categories=CATEGORY_FILTERS):
+        self.df = df
+        self.n = len(df)
+        self._bitmaps = {}
+        for c in [c for c in categories if c in df.columns]:
+            codes, uniques = pd.factorize(df[c])
+            # Une ligne = un bit (np.packbits) : 8 fois moins de mémoire qu'un masque booléen
+            self._bitmaps[c] = {value: np.packbits(codes == i) for i, value in enumerate(uniques)}
+        self._orders = {}
+
+    def values(self, column: str) -> list:
+        return list(self._bitmaps[column])
+
+    def _order(self, column: str) -> tuple[np.ndarray, np.ndarray, int]:
+        # Lignes triées par valeur croissante (NaN en fin), construit à la première utilisation
+        if column not in self._orders:
+            series = self.df[column]
+            if pd.api.types.is_numeric_dtype(series):
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                # Colonnes texte : rang de la valeur dans l'ordre alphabétique
+                codes, _ = pd.factorize(series, sort=True)
+                values = np.where(codes >= 0, codes, np.nan)
+            order = np.argsort(values, kind="stable")
+            n_valid = int((~np.isnan(values)).sum())
+            self._orders[column] = (order, values[order[:n_valid]], n_valid)
+        return self._orders[column]
+
+    def mask(self, categories: dict | None = None, minimums: dict | None = None) -> np.ndarray:
+        # categories : {colonne: valeurs acceptées} ; minimums : {colonne: seuil inclus}
+        bits = np.full((self.n + 7) // 8, 0xFF, dtype=np.uint8)
+        for column, accepted in (categories or {}).items():
+            if not accepted:
+                continue
+            selected = np.zeros_like(bits)
+            for value in accepted:
+                if value in self._bitmaps[column]:
+                    selected |= self._bitmaps[column][value]
+            bits &= selected
+        for column, threshold in (minimums or {}).items():
+            if threshold is None:
+                continue
+            order, sorted_values, n_valid = self._order(column)
+            above = np.zeros(self.n, dtype=bool)
+            above[order[np.searchsorted(sorted_values, threshold, side="left"):n_valid]] = True
+            bits &= np.packbits(above)
+        return np.unpackbits(bits, count=self.n).astype(bool)
+
+    def sorted_rows(self, mask: np.ndarray, sort_by: str, ascending: bool = True) -> np.ndarray:
+        # Lignes retenues dans l'ordre de tri, sans trier à nouveau (NaN toujours en fin)
+        order, _, n_valid = self._order(sort_by)
+        valid, missing = order[:n_valid], order[n_valid:]
+        if not ascending:
+            valid = valid[::-1]
+        return np.concatenate([valid[mask[valid]], missing[mask[missing]]])
+
+    def page(self, mask: np.ndarray, sort_by: str, ascending: bool = True,
+             page: int = 1, page_size: int = 50) -> tuple[pd.DataFrame, int]:
+        rows = self.sorted_rows(mask, sort_by, ascending)
+        start = (max(page, 1) - 1) * page_size
+        return self.df.iloc[rows[start:start + page_size]], len(rows)
@@ -0,0 +1,144 @@
+import importlib.util
+import io
+import os
+
+import pandas as pd
+
+# Extension -> format ; Parquet et Arrow IPC nécessitent pyarrow (dépendance optionnelle)
+EXTENSIONS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+FILE_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+MIME_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+
+
+def has_pyarrow() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def available_formats() -> list[str]:
+    return list(FILE_EXTENSIONS) if has_pyarrow() else ["csv"]
+
+
+def accepted_extensions() -> list[str]:
+    # Extensions proposées par le sélecteur de fichiers, selon les formats disponibles
+    formats = available_formats()
+    return [ext.lstrip(".") for ext, fmt in EXTENSIONS.items() if fmt in formats]
+
+
+def detect_format(name: str, default: str | None = "csv") -> str:
+    # Extension inconnue : CSV par défaut, comme l'ancienne lecture par pd.read_csv
+    ext = os.path.splitext(str(name))[1].lower()
+    if ext not in EXTENSIONS:
+        if default is not None:
+            return default
+        raise ValueError(f"Format de fichier non pris en charge : {ext or name}")
+    return EXTENSIONS[ext]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Les formats Parquet et Arrow nécessitent pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+# ------------------| Lecture |------------------
+def read_table(source, name: str | None = None) -> pd.DataFrame:
+    # source : chemin local ou contenu (bytes) ; le format est déduit du nom
+    fmt = detect_format(name or source)
+    in_memory = isinstance(source, (bytes, bytearray))
+    if fmt == "csv":
+        return pd.read_csv(io.BytesIO(source) if in_memory else source)
+
+    pa = _pyarrow()
+    if in_memory:
+        stream = pa.BufferReader(source)
+    elif fmt == "arrow":
+        # Fichier local projeté en mémoire : ouverture sans copie, pages partagées entre processus
+        stream = pa.memory_map(source, "r")
+    else:
+        stream = source
+    if fmt == "parquet":
+        table = pa.parquet.read_table(stream)
+    else:
+        table = pa.ipc.open_file(stream).read_all()
+    # Les métadonnées pandas du fichier restaurent les types (catégories, float32, entiers réduits)
+    return table.to_pandas(split_blocks=True)
+
+
+# ------------------| Écriture |------------------
+def _to_arrow(df: pd.DataFrame, schema=None):
+    pa = _pyarrow()
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def write_table(df: pd.DataFrame, path: str, fmt: str | None = None) -> None:
+    fmt = fmt or detect_format(path)
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+        return
+    with TableWriter(path, fmt) as writer:
+        writer.write(df)
+
+
+def to_bytes(df: pd.DataFrame, fmt: str = "csv") -> bytes:
+    if fmt == "csv":
+        return df.to_csv(index=False).encode("utf-8")
+    pa = _pyarrow()
+    sink = pa.BufferOutputStream()
+    table = _to_arrow(df)
+    if fmt == "parquet":
+        pa.parquet.write_table(table, sink)
+    else:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+class TableWriter:
+    # Écriture progressive par blocs (CSV, Parquet ou Arrow) ; le schéma du premier bloc fait référence
+    def __init__(self, path: str, fmt: str | None = None):
+        self.path = path
+        self.fmt = fmt or detect_format(path)
+        self._writer = None
+        self._schema = None
+        self._header = True
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.fmt == "csv":
+            df.to_csv(self.path, index=False, header=self._header, mode="w" if self._header else "a")
+            self._header = False
+            return
+        pa = _pyarrow()
+        table = _to_arrow(df, self._schema)
+        if self._writer is None:
+            self._schema = table.schema
+            if self.fmt == "parquet":
+                self._writer = pa.parquet.ParquetWriter(self.path, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(self.path, self._schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,194 @@
+import glob
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from data.batch import file_hash
+from data.formats import FILE_EXTENSIONS, has_pyarrow, read_table, write_table
+from data.instrumentation import run_stage
+from data.verify_data import STAGES, _handle_missing
+
+# Arrow conserve les types nettoyés ; CSV si pyarrow n'est pas installé
+STORE_FORMAT = "arrow" if has_pyarrow() else "csv"
+META_NAME = "store.json"
+
+
+def _key_tuples(df: pd.DataFrame, keys: list[str]) -> list[tuple]:
+    columns = [df[c].astype(object).where(df[c].notna(), None) for c in keys]
+    return list(zip(*columns))
+
+
+def _row_hashes(df: pd.DataFrame, columns: list[str]) -> np.ndarray:
+    # Empreinte de chaque ligne, indépendante du type stocké (1 et 1.0, catégorie et texte)
+    normalized = {}
+    for c in columns:
+        col = df[c] if c in df.columns else pd.Series(np.nan, index=df.index)
+        if pd.api.types.is_numeric_dtype(col):
+            normalized[c] = col.astype(np.float64)
+        else:
+            normalized[c] = col.astype(object).where(col.notna(), None).astype(str)
+    hashes = pd.util.hash_pandas_object(pd.DataFrame(normalized, index=df.index), index=False).to_numpy()
+    # int64 : relu à l'identique depuis un segment CSV
+    return hashes.view(np.int64)
+
+
+def clean_delta(raw: pd.DataFrame, errors: list) -> tuple[pd.DataFrame, list[dict]]:
+    # Mêmes étapes que clean_dataframe, sans supprimer les colonnes vides : un petit lot peut en avoir
+    stages = []
+    df = raw
+    for name, stage in STAGES:
+        kwargs = {"drop_empty": False} if stage is _handle_missing else {}
+        df, record = run_stage(name, stage, df, errors, memory=None, verbose=False, **kwargs)
+        stages.append(record)
+    return df, stages
+
+
+class CleanedStore:
+    # Jeu nettoyé persistant, complété lot par lot : segments en ajout seul et index par joueur.
+    # Un seul processus doit écrire dans un même dossier à la fois.
+    def __init__(self, path: str, fmt: str | None = None):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta = {}
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        self.fmt = meta.get("format") or fmt or STORE_FORMAT
+        self.keys = meta.get("keys")
+        self.columns = meta.get("columns")
+        self.next_segment = meta.get("next_segment", 1)
+        self.sources = meta.get("sources", {})
+        # clé (joueur[, saison]) -> (segment, ligne, Min, MP, empreinte)
+        self._index = {}
+        for path in self._files("index"):
+            part = read_table(path)
+            entries = zip(part["segment"], part["row"], part["Min"], part["MP"], part["hash"])
+            self._index.update(zip(_key_tuples(part, self.keys), entries))
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.path, META_NAME)
+
+    def _file(self, kind: str, segment: int) -> str:
+        return os.path.join(self.path, f"{kind}-{segment:06d}{FILE_EXTENSIONS[self.fmt]}")
+
+    def _files(self, kind: str) -> list[str]:
+        return sorted(glob.glob(os.path.join(self.path, f"{kind}-*{FILE_EXTENSIONS[self.fmt]}")))
+
+    def _save_meta(self) -> None:
+        meta = {"format": self.fmt, "keys": self.keys, "columns": self.columns,
+                "next_segment": self.next_segment, "sources": self.sources}
+        tmp_path = self._meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self._meta_path)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+# ------------------| Fusion d'un nouveau lot |------------------
+    def merge(self, raw: pd.DataFrame) -> dict:
+        # Seules les lignes du lot sont nettoyées ; seuls les joueurs du lot sont consultés et réécrits
+        errors = []
+        delta, stages = clean_delta(raw, errors)
+        if self.keys is None:
+            self.keys = ["Player"] + (["Season"] if "Season" in delta.columns else [])
+        if self.columns is None:
+            self.columns = list(delta.columns)
+        else:
+            self.columns += [c for c in delta.columns if c not in self.columns]
+
+        keys = _key_tuples(delta, self.keys)
+        hashes = _row_hashes(delta, self.columns)
+        previous = [self._index.get(k) for k in keys]
+        is_new = np.array([p is None for p in previous], dtype=bool)
+        old_min = np.array([np.nan if p is None else p[2] for p in previous], dtype=np.float64)
+        old_mp = np.array([np.nan if p is None else p[3] for p in previous], dtype=np.float64)
+        old_hash = np.array([0 if p is None else p[4] for p in previous], dtype=np.int64)
+        same = ~is_new & (old_hash == hashes)
+
+        # Même règle que la déduplication complète : la ligne avec le plus de minutes (puis de matchs) l'emporte ;
+        # à égalité, la plus récente
+        new_min = delta["Min"].to_numpy(dtype=np.float64)
+        new_mp = delta["MP"].to_numpy(dtype=np.float64)
+        wins = (new_min > old_min) | ((new_min == old_min) & (new_mp >= old_mp))
+        updated = ~is_new & ~same & wins
+        write = is_new | updated
+
+        status = np.select([is_new, updated, same], ["inserted", "updated", "unchanged"], "stale")
+        changes = delta[self.keys].assign(status=status)
+
+        segment = None
+        if write.any():
+            segment = self.next_segment
+            rows = delta[write].reset_index(drop=True)
+            index = rows[self.keys].assign(segment=segment, row=np.arange(len(rows)),
+                                           Min=new_min[write], MP=new_mp[write], hash=hashes[write])
+            # Segment puis index : un segment sans index est ignoré à la réouverture
+            write_table(rows.reindex(columns=self.columns), self._file("segment", segment))
+            write_table(index, self._file("index", segment))
+            for k, entry in zip((k for k, w in zip(keys, write) if w),
+                                zip(index["segment"], index["row"], index["Min"], index["MP"], index["hash"])):
+                self._index[k] = entry
+            self.next_segment += 1
+        self._save_meta()
+
+        counts = pd.Series(status).value_counts()
+        return {
+            "rows_in": len(raw),
+            "rows_cleaned": len(delta),
+            "inserted": int(counts.get("inserted", 0)),
+            "updated": int(counts.get("updated", 0)),
+            # Lignes identiques, ou moins complètes que celles déjà stockées
+            "unchanged": int(counts.get("unchanged", 0) + counts.get("stale", 0)),
+            "segment": segment,
+            "players": len(self._index),
+            "errors": errors,
+            "stages": stages,
+            "changes": changes,
+        }
+
+    def merge_file(self, path: str, force: bool = False) -> dict | None:
+        # Un fichier déjà fusionné (même empreinte) n'est pas relu ; None dans ce cas
+        digest = file_hash(path)
+        if digest in self.sources and not force:
+            return None
+        summary = self.merge(read_table(path))
+        self.sources[digest] = os.path.basename(path)
+        self._save_meta()
+        return summary
+
+# ------------------| Lecture et compactage |------------------
+    def to_frame(self) -> pd.DataFrame:
+        # Lignes vivantes de chaque segment, triées comme la sortie de clean_dataframe
+        live = {}
+        for segment, row, *_ in self._index.values():
+            live.setdefault(int(segment), []).append(int(row))
+        frames = [read_table(self._file("segment", segment)).iloc[sorted(rows)]
+                  for segment, rows in sorted(live.items())]
+        if not frames:
+            return pd.DataFrame(columns=self.columns or [])
+        df = pd.concat(frames, ignore_index=True).reindex(columns=self.columns)
+        return df.sort_values(self.keys, kind="stable").reset_index(drop=True)
+
+    def compact(self) -> None:
+        # Réécrit les lignes vivantes en un seul segment et supprime les lignes remplacées
+        old_files = self._files("segment") + self._files("index")
+        df = self.to_frame()
+        self._index = {}
+        if len(df):
+            segment = self.next_segment
+            keys = _key_tuples(df, self.keys)
+            hashes = _row_hashes(df, self.columns)
+            index = df[self.keys].assign(segment=segment, row=np.arange(len(df)),
+                                         Min=df["Min"].to_numpy(dtype=np.float64),
+                                         MP=df["MP"].to_numpy(dtype=np.float64), hash=hashes)
+            write_table(df, self._file("segment", segment))
+            write_table(index, self._file("index", segment))
+            self._index = dict(zip(keys, zip(index["segment"], index["row"], index["Min"], index["MP"], index["hash"])))
+            self.next_segment += 1
+        self._save_meta()
+        for path in old_files:
+            os.remove(path)
@@ -0,0 +1,147 @@
+import multiprocessing
+import os
+import queue
+import re
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+from data.formats import read_table, write_table
+from data.instrumentation import run_stage
+from data.verify_data import COMPACT_STAGE, STAGES, _drop_duplicates, clean_dataframe
+
+# Deux années consécutives 19xx/20xx, non collées à d'autres chiffres ("2023-24", "2023_2024")
+SEASON_PATTERN = re.compile(r"(?<!\d)((?:19|20)\d{2})\s*[-_/]\s*((?:19|20)?\d{2})(?!\d)")
+# Intervalle de relève de la progression des processus de nettoyage (secondes)
+POLL_INTERVAL = 0.1
+
+
+class CleaningCancelled(Exception):
+    pass
+
+
+def detect_season(name: str) -> str | None:
+    # "players_2023-24.csv" -> "2023-2024" ; None si le nom ne contient pas de saison
+    stem = os.path.splitext(os.path.basename(name))[0]
+    for match in SEASON_PATTERN.finditer(stem):
+        start, end = (int(year) for year in match.groups())
+        if end == start + 1 or (end < 100 and end == (start + 1) % 100):
+            return f"{start}-{start + 1}"
+    return None
+
+
+def _clean_file(name: str, source, tag: bool = True, report=None, cancel=None) -> tuple[pd.DataFrame, dict]:
+    # Exécuté dans un processus séparé : lecture et nettoyage d'un fichier.
+    # report(fichier, étape) après chaque étape ; cancel.is_set() vérifié entre deux étapes
+    source_name = os.path.basename(name)
+
+    def step(stage: str) -> None:
+        if report is not None:
+            report((source_name, stage))
+        if cancel is not None and cancel.is_set():
+            raise CleaningCancelled(source_name)
+
+    df_original = read_table(source, name)
+    step("lecture")
+    df = clean_dataframe(df_original, on_stage=lambda record: step(record["stage"]))
+    if tag:
+        # Saison introuvable : colonne laissée vide, le nom du fichier reste dans Source
+        season = detect_season(name)
+        if "Season" not in df.columns and season is not None:
+            df["Season"] = season
+        df["Source"] = source_name
+    summary = {
+        "source": source_name,
+        "rows_in": len(df_original),
+        "columns_in": len(df_original.columns),
+        "rows_out": len(df),
+        "errors": df.attrs.get("errors") or [],
+        "stages": df.attrs.get("stages") or [],
+    }
+    return df, summary
+
+
+def _clean_in_pool(sources: list[tuple[str, object]], workers: int, on_step, cancel) -> list:
+    # Progression relayée par une file partagée ; à l'annulation, les fichiers pas encore commencés sont abandonnés
+    # et ceux en cours s'arrêtent à la fin de leur étape
+    with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers=workers) as pool:
+        progress = manager.Queue()
+        shared_cancel = manager.Event()
+        futures = [pool.submit(_clean_file, name, source, True, progress.put, shared_cancel)
+                   for name, source in sources]
+        pending = set(futures)
+        try:
+            while pending:
+                _, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                while True:
+                    try:
+                        on_step(*progress.get_nowait())
+                    except queue.Empty:
+                        break
+                if cancel is not None and cancel.is_set():
+                    raise CleaningCancelled()
+        except CleaningCancelled:
+            shared_cancel.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+        return [future.result() for future in futures]
+
+
+def load_files(sources: list[tuple[str, object]], jobs: int | None = None, compact: bool = False,
+               on_progress=None, cancel=None) -> tuple[pd.DataFrame, tuple[int, int]]:
+    # sources : (nom, chemin ou contenu) ; un fichier par saison ou par championnat.
+    # on_progress(fait, total, fichier, étape) après chaque étape ; cancel : threading.Event, CleaningCancelled levée
+    # entre deux étapes une fois positionné
+    total = len(sources) * (1 + len(STAGES)) + (len(sources) > 1) + compact
+    done = 0
+
+    def on_step(source: str, stage: str) -> None:
+        nonlocal done
+        done += 1
+        if on_progress is not None:
+            on_progress(done, total, source, stage)
+        if cancel is not None and cancel.is_set():
+            raise CleaningCancelled(source)
+
+    if len(sources) == 1:
+        results = [_clean_file(*sources[0], tag=False, report=lambda event: on_step(*event), cancel=cancel)]
+    else:
+        workers = min(jobs or os.cpu_count() or 1, len(sources))
+        if on_progress is None and cancel is None:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_clean_file, *zip(*sources)))
+        else:
+            results = _clean_in_pool(sources, workers, on_step, cancel)
+
+    frames = [df for df, _ in results]
+    summaries = [summary for _, summary in results]
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    errors = [err for summary in summaries for err in summary["errors"]]
+    stages = []
+    if len(frames) > 1:
+        # Un même joueur peut apparaître dans deux fichiers de la même saison
+        df, record = run_stage("fusion", _drop_duplicates, df, errors, verbose=False)
+        stages.append(record)
+        on_step("", "fusion")
+    if compact:
+        name, stage = COMPACT_STAGE
+        df, record = run_stage(name, stage, df, errors)
+        stages.append(record)
+        on_step("", name)
+
+    df.attrs["errors"] = errors
+    df.attrs["stages"] = [r for summary in summaries for r in summary["stages"]] + stages
+    df.attrs["files"] = [{k: v for k, v in s.items() if k != "stages"} for s in summaries]
+
+    original_shape = (sum(s["rows_in"] for s in summaries), max(s["columns_in"] for s in summaries))
+    return df, original_shape
+
+
+def clean_csvs(input_paths: list[str], output_path: str, jobs: int | None = None) -> None:
+    # Équivalent sans interface de l'import multi-fichiers du dashboard
+    df, _ = load_files([(path, path) for path in input_paths], jobs=jobs)
+    write_table(df, output_path)
+    print("Fichiers nettoyés :", len(input_paths), "->", output_path, f"({len(df)} lignes)")
+    for err in df.attrs.get("errors") or []:
+        print(" -", err)
@@ -0,0 +1,115 @@
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+logger = logging.getLogger("soccer_stats.cleaning")
+
+# Intervalle d'échantillonnage de la mémoire résidente pendant une étape (secondes)
+SAMPLE_INTERVAL = 0.002
+
+
+def rss_bytes() -> int | None:
+    # Mémoire résidente du processus (Linux) ; None si /proc n'est pas disponible
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _PeakSampler:
+    # Échantillonne la mémoire résidente dans un thread pour estimer le pic d'une étape
+    def __init__(self):
+        self.start_rss = rss_bytes()
+        self.peak = self.start_rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            self._sample()
+
+    def _sample(self):
+        value = rss_bytes()
+        if value is not None and (self.peak is None or value > self.peak):
+            self.peak = value
+
+    def __enter__(self):
+        if self.start_rss is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.start_rss is not None:
+            self._stop.set()
+            self._thread.join()
+            self._sample()
+
+    @property
+    def delta(self) -> int | None:
+        if self.start_rss is None:
+            return None
+        return self.peak - self.start_rss
+
+
+def _changed_columns(before: pd.DataFrame, after: pd.DataFrame) -> list[str]:
+    removed = [c for c in before.columns if c not in after.columns]
+    added = [c for c in after.columns if c not in before.columns]
+    if len(before) != len(after):
+        return removed + added
+    changed = [
+        c for c in before.columns
+        if c in after.columns and (before[c].dtype != after[c].dtype or not before[c].equals(after[c]))
+    ]
+    return removed + added + changed
+
+
+def run_stage(name: str, stage, df: pd.DataFrame, errors: list, memory: str | None = "rss",
+              on_stage=None, **kwargs) -> tuple[pd.DataFrame, dict]:
+    # Exécute une étape du nettoyage et mesure durée, lignes, colonnes modifiées et pic mémoire
+    before = df.copy(deep=False)
+    rows_in = len(df)
+    n_errors = len(errors)
+
+    if memory == "tracemalloc":
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        df = stage(df, errors, **kwargs)
+        seconds = time.perf_counter() - start
+        peak_delta = tracemalloc.get_traced_memory()[1] - base
+        if started:
+            tracemalloc.stop()
+    elif memory == "rss":
+        with _PeakSampler() as sampler:
+            start = time.perf_counter()
+            df = stage(df, errors, **kwargs)
+            seconds = time.perf_counter() - start
+        peak_delta = sampler.delta
+    else:
+        start = time.perf_counter()
+        df = stage(df, errors, **kwargs)
+        seconds = time.perf_counter() - start
+        peak_delta = None
+
+    record = {
+        "stage": name,
+        "seconds": seconds,
+        "rows_in": rows_in,
+        "rows_out": len(df),
+        "columns_changed": _changed_columns(before, df),
+        "peak_memory_delta": peak_delta,
+        "errors": errors[n_errors:],
+    }
+    logger.info("%s : %.3f s, %d -> %d lignes, %d colonne(s) modifiée(s)",
+                name, seconds, rows_in, len(df), len(record["columns_changed"]))
+    if on_stage is not None:
+        on_stage(record)
+    return df, record
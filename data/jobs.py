@@ -0,0 +1,90 @@
+import threading
+
+from data.ingest import CleaningCancelled
+
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class CleaningJob:
+    # Nettoyage exécuté dans un thread : progression par étape, annulation, résultat partagé entre sessions.
+    # run(on_progress, cancel) produit le résultat ; le travail n'est annulé que lorsque plus aucune session ne le suit.
+    def __init__(self, key: str, run=None, result=None, on_finish=None):
+        self.key = key
+        self.done = 0
+        self.total = 1
+        self.source = ""
+        self.stage = None
+        self.result = result
+        self.error = None
+        self.state = DONE if run is None else RUNNING
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+        self._watchers = set()
+        self._lock = threading.Lock()
+        self._on_finish = on_finish
+        if run is None:
+            self.done = self.total
+            self._finished.set()
+        else:
+            self._thread = threading.Thread(target=self._run, args=(run,), name=f"cleaning-{key[:8]}", daemon=True)
+            self._thread.start()
+
+    def _progress(self, done: int, total: int, source: str, stage: str) -> None:
+        self.done, self.total, self.source, self.stage = done, total, source, stage
+
+    def _run(self, run) -> None:
+        try:
+            self.result = run(self._progress, self._cancel)
+            self.state = DONE
+        except CleaningCancelled:
+            self.state = CANCELLED
+        except Exception as e:
+            self.error = e
+            self.state = FAILED
+        finally:
+            if self._on_finish is not None:
+                self._on_finish(self)
+            self._finished.set()
+
+    @property
+    def progress(self) -> float:
+        return min(self.done / self.total, 1.0) if self.total else 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._finished.wait(timeout)
+
+    def get(self):
+        # Attend la fin du travail ; relève l'erreur du nettoyage
+        self.wait()
+        if self.state == FAILED:
+            raise self.error
+        if self.state == CANCELLED:
+            raise CleaningCancelled(self.key)
+        return self.result
+
+# ------------------| Sessions qui suivent le travail |------------------
+    def attach(self, watcher: str) -> None:
+        with self._lock:
+            self._watchers.add(watcher)
+
+    def detach(self, watcher: str) -> None:
+        # La dernière session qui se retire annule le travail
+        with self._lock:
+            self._watchers.discard(watcher)
+            if not self._watchers and not self.finished:
+                self._cancel.set()
+
+    @property
+    def cancelling(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def watchers(self) -> int:
+        return len(self._watchers)
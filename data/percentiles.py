@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+from data.verify_data import NUMERIC_COLS
+
+COHORT = ("Pos", "Comp")
+# 5 matchs complets : en dessous, le joueur est situé par rapport aux joueurs éligibles sans compter dans la cohorte
+MIN_MINUTES = 450
+# Percentiles entiers 0..100 sur un octet ; 255 = pas de valeur
+MISSING = 255
+
+
+class PercentileIndex:
+    # Percentile de chaque joueur sur chaque colonne numérique, dans sa cohorte (poste × championnat par défaut).
+    # Une matrice uint8 par cohorte : la lecture d'un joueur est un simple accès à une ligne.
+    def __init__(self, df: pd.DataFrame, columns: list[str] | None = None, min_minutes: float = MIN_MINUTES):
+        self.df = df
+        self.columns = [c for c in (columns or NUMERIC_COLS)
+                        if c in df.columns and pd.api.types.is_numeric_dtype(df[c])]
+        self._col_pos = {c: i for i, c in enumerate(self.columns)}
+        self.min_minutes = min_minutes
+        if "Min" in df.columns:
+            minutes = df["Min"].to_numpy(dtype=np.float64, na_value=np.nan)
+        elif "90s" in df.columns:
+            minutes = df["90s"].to_numpy(dtype=np.float64, na_value=np.nan) * 90
+        else:
+            minutes = np.full(len(df), np.inf)
+        self.eligible = minutes >= min_minutes
+        self._matrices = {}
+        self._build(COHORT)
+
+    def _cohort_codes(self, cohort: tuple) -> np.ndarray:
+        cohort = tuple(c for c in cohort if c in self.df.columns)
+        if not cohort:
+            return np.zeros(len(self.df), dtype=np.int64)
+        # Poste ou championnat manquant : cohorte à part
+        codes = self.df.groupby(list(cohort), sort=False, observed=True, dropna=False).ngroup()
+        return codes.to_numpy(dtype=np.int64)
+
+    def _build(self, cohort: tuple) -> None:
+        n, k = len(self.df), len(self.columns)
+        # Une colonne par ligne (k × n) : tris et cumuls sur des données contiguës
+        values = self.df[self.columns].to_numpy(dtype=np.float64, na_value=np.nan).T.copy()
+        groups = self._cohort_codes(cohort)
+
+        # Clé de tri = cohorte + valeur ramenée dans [0, 0.5] : un seul tri classe chaque colonne par cohorte
+        # puis par valeur, et les cohortes occupent les mêmes positions dans toutes les colonnes
+        lo = np.nanmin(values, axis=1, initial=np.inf, keepdims=True)
+        hi = np.nanmax(values, axis=1, initial=-np.inf, keepdims=True)
+        missing = np.isnan(values)
+        keys = (values - lo) / np.where(hi > lo, hi - lo, 1.0) * 0.5
+        keys[missing] = 0.75
+        keys += groups
+        order = np.argsort(keys, axis=1)
+        keys = np.take_along_axis(keys, order, axis=1)
+        missing = np.take_along_axis(missing, order, axis=1)
+
+        # Nombre cumulé de valeurs éligibles jusqu'à chaque position triée
+        cumulative = np.zeros((k, n + 1), dtype=np.int32)
+        np.cumsum(~missing & self.eligible[order], axis=1, out=cumulative[:, 1:])
+
+        # Première et dernière position de chaque groupe d'ex æquo
+        positions = np.arange(n)
+        starts = np.ones((k, n), dtype=bool)
+        np.not_equal(keys[:, 1:], keys[:, :-1], out=starts[:, 1:])
+        run_start = np.maximum.accumulate(np.where(starts, positions, 0), axis=1)
+        ends = np.ones((k, n), dtype=bool)
+        ends[:, :-1] = starts[:, 1:]
+        run_end = np.minimum.accumulate(np.where(ends, positions, n - 1)[:, ::-1], axis=1)[:, ::-1]
+
+        # Début et fin de chaque cohorte, identiques pour toutes les colonnes
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(groups))])
+        sorted_groups = np.sort(groups)
+        base = cumulative[:, bounds[sorted_groups]]
+        total = cumulative[:, bounds[sorted_groups + 1]] - base
+        below = np.take_along_axis(cumulative, run_start, axis=1) - base
+        up_to = np.take_along_axis(cumulative, run_end + 1, axis=1) - base
+        # Ex æquo comptés pour moitié (percentileofscore, kind="mean")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pct = np.rint(50.0 * (below + up_to) / total)
+        pct[missing | (total == 0)] = MISSING
+
+        matrix = np.empty((k, n), dtype=np.uint8)
+        np.put_along_axis(matrix, order, pct.astype(np.uint8), axis=1)
+        # Stockage n × k : les percentiles d'un joueur sont contigus
+        self._matrices[cohort] = np.ascontiguousarray(matrix.T)
+
+    def matrix(self, cohort: tuple = COHORT) -> np.ndarray:
+        cohort = tuple(cohort)
+        if cohort not in self._matrices:
+            self._build(cohort)
+        return self._matrices[cohort]
+
+    def percentile(self, row: int, column: str, cohort: tuple = COHORT) -> int | None:
+        value = self.matrix(cohort)[row, self._col_pos[column]]
+        return None if value == MISSING else int(value)
+
+    def percentiles(self, row: int, columns: list[str] | None = None, cohort: tuple = COHORT) -> pd.Series:
+        # Percentiles d'un joueur (NaN si pas de valeur), dans l'ordre des colonnes demandées
+        columns = [c for c in (columns or self.columns) if c in self._col_pos]
+        values = self.matrix(cohort)[row, [self._col_pos[c] for c in columns]].astype(np.float64)
+        values[values == MISSING] = np.nan
+        return pd.Series(values, index=columns)
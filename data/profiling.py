@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+import pandas as pd
+
+# Mode profilage : variable d'environnement (ou paramètre d'URL ?profile=1 dans le dashboard)
+PROFILE_ENV = "SOCCER_STATS_PROFILE"
+PROFILE_LOG_ENV = "SOCCER_STATS_PROFILE_LOG"
+DEFAULT_LOG = "profiling.jsonl"
+LATENCY_QUANTILES = (0.5, 0.9, 0.99)
+
+# Plusieurs sessions écrivent dans le même journal
+_log_lock = threading.Lock()
+
+
+def profiling_requested(query_value: str | None = None) -> bool:
+    # Activé par la variable d'environnement ou par le paramètre d'URL
+    values = (os.environ.get(PROFILE_ENV), query_value)
+    return any(str(v).strip().lower() in ("1", "true", "yes", "on") for v in values if v is not None)
+
+
+def log_path() -> str:
+    return os.environ.get(PROFILE_LOG_ENV, DEFAULT_LOG)
+
+
+class Profiler:
+    # Durées des sections nommées d'une réexécution du dashboard et coût de chaque graphique.
+    # Désactivé : sections et graphiques ne sont pas mesurés.
+    def __init__(self, enabled: bool = False, session: str | None = None, path: str | None = None):
+        self.enabled = enabled
+        self.session = session
+        self.path = path or log_path()
+        self.run_id = uuid.uuid4().hex[:12]
+        self.records = []
+        self._written = 0
+        self._start = time.perf_counter()
+
+    def _record(self, kind: str, name: str, **values) -> None:
+        self.records.append({
+            "time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "session": self.session,
+            "run": self.run_id,
+            "kind": kind,
+            "name": name,
+            **values,
+        })
+
+    def section(self, name: str):
+        return self._section(name) if self.enabled else nullcontext()
+
+    @contextmanager
+    def _section(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record("section", name, seconds=time.perf_counter() - start)
+
+    def figure(self, name: str, fig, build_seconds: float) -> None:
+        # Sérialisation mesurée à part (to_json, comme l'envoi au navigateur) et taille de la figure envoyée
+        if not self.enabled:
+            return
+        start = time.perf_counter()
+        payload = fig.to_json()
+        self._record("chart", name, seconds=build_seconds, serialize_seconds=time.perf_counter() - start,
+                     bytes=len(payload.encode("utf-8")), traces=len(fig.data))
+
+    def finish(self) -> None:
+        # Durée totale de la réexécution, puis écriture du journal
+        if self.enabled:
+            self._record("run", "total", seconds=time.perf_counter() - self._start)
+            self.flush()
+
+    def flush(self) -> None:
+        # Ajoute au journal les mesures pas encore écrites (une ligne JSON par mesure)
+        if not self.enabled or self._written == len(self.records):
+            return
+        lines = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in self.records[self._written:])
+        with _log_lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        self._written = len(self.records)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.records, columns=["kind", "name", "seconds", "serialize_seconds", "bytes", "traces"])
+
+
+def summarize_log(path: str | None = None, quantiles=LATENCY_QUANTILES) -> pd.DataFrame:
+    # Percentiles de latence par section et par graphique, sur toutes les sessions journalisées
+    path = path or log_path()
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    records = pd.read_json(path, lines=True)
+    if records.empty:
+        return records
+    grouped = records.groupby(["kind", "name"], sort=True)
+    summary = grouped["seconds"].quantile(list(quantiles)).unstack()
+    summary.columns = [f"p{round(q * 100)}" for q in quantiles]
+    summary.insert(0, "count", grouped.size())
+    if "bytes" in records.columns:
+        summary["bytes_p50"] = grouped["bytes"].median()
+    return summary.reset_index()
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+# Classement « compétition » (1, 2, 2, 4) ou « dense » (1, 2, 2, 3)
+RANK_METHODS = {"competition": "min", "dense": "dense"}
+SCOPES = (None, "Comp", "Pos")
+
+
+class RankIndex:
+    # Rangs de chaque joueur sur toutes les colonnes numériques, calculés une fois par périmètre
+    def __init__(self, df: pd.DataFrame, method: str = "competition"):
+        if method not in RANK_METHODS:
+            raise ValueError(f"Méthode de classement inconnue : {method}")
+        self.df = df
+        self.method = method
+        self.columns = df.select_dtypes(include="number").columns.tolist()
+        self._col_pos = {c: i for i, c in enumerate(self.columns)}
+        self._ranks = {}
+        self._totals = {}
+
+        # Le classement global sert à chaque affichage de joueur : construit dès le chargement
+        self._build(None)
+
+    def _build(self, scope: str | None) -> None:
+        if scope is not None and scope not in self.df.columns:
+            raise KeyError(scope)
+        values = self.df[self.columns]
+        if scope is None:
+            ranks = values.rank(method=RANK_METHODS[self.method], ascending=False)
+            totals = np.broadcast_to(values.notna().sum().to_numpy(), values.shape)
+        else:
+            grouped = values.groupby(self.df[scope], observed=True)
+            ranks = grouped.rank(method=RANK_METHODS[self.method], ascending=False)
+            totals = grouped.transform("count").to_numpy()
+        self._ranks[scope] = ranks.to_numpy(dtype=np.float64)
+        self._totals[scope] = totals
+
+    def _arrays(self, scope: str | None) -> tuple[np.ndarray, np.ndarray]:
+        if scope not in self._ranks:
+            self._build(scope)
+        return self._ranks[scope], self._totals[scope]
+
+    def rank(self, row: int, column: str, scope: str | None = None) -> tuple[int | None, int]:
+        ranks, totals = self._arrays(scope)
+        j = self._col_pos[column]
+        value = ranks[row, j]
+        return (None if np.isnan(value) else int(value)), int(totals[row, j])
+
+    def leaderboard(self, column: str, n: int = 10, scope: str | None = None, group=None) -> pd.DataFrame:
+        ranks, _ = self._arrays(scope)
+        col = ranks[:, self._col_pos[column]]
+        mask = ~np.isnan(col)
+        if scope is not None and group is not None:
+            mask &= (self.df[scope] == group).to_numpy()
+        rows = np.flatnonzero(mask)
+        rows = rows[np.argsort(col[rows], kind="stable")[:n]]
+        out = self.df.iloc[rows].copy()
+        out.insert(0, "Rang", col[rows].astype(int))
+        return out
@@ -0,0 +1,112 @@
+import bisect
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+SEARCH_FIELDS = ("Player", "Squad", "Nation")
+NGRAM = 3
+
+
+def normalize_text(value) -> str:
+    # "Mbappé" -> "mbappe" : accents retirés, casse ignorée
+    text = unicodedata.normalize("NFKD", str(value))
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold().strip()
+
+
+class _FieldIndex:
+    # Index d'une colonne : valeurs distinctes normalisées, triées, avec n-grammes (1 à 3 lettres) et débuts de mots
+    def __init__(self, series: pd.Series):
+        codes, uniques = pd.factorize(series, sort=False)
+        self.keys = [normalize_text(v) for v in uniques]
+        positions = pd.Series(np.arange(len(codes))).groupby(codes).indices
+        self.rows = [positions[i] for i in range(len(uniques))]
+        self.counts = np.array([len(r) for r in self.rows], dtype=np.int64)
+
+        self.sorted_ids = np.array(sorted(range(len(self.keys)), key=self.keys.__getitem__), dtype=np.int64)
+        self.sorted_keys = [self.keys[i] for i in self.sorted_ids]
+        # Position alphabétique de chaque valeur, pour trier les résultats sans comparer de chaînes
+        self.alpha_rank = np.empty(len(self.keys), dtype=np.int64)
+        self.alpha_rank[self.sorted_ids] = np.arange(len(self.keys))
+
+        grams = {}
+        words = []
+        # Parcours dans l'ordre alphabétique : chaque liste de valeurs est déjà triée pour l'affichage
+        for vid in self.sorted_ids.tolist():
+            key = self.keys[vid]
+            for gram in {key[i:i + n] for n in range(1, NGRAM + 1) for i in range(len(key) - n + 1)}:
+                grams.setdefault(gram, []).append(vid)
+            words.extend((word, vid) for word in key.split()[1:])
+        self.grams = {g: np.array(ids, dtype=np.int64) for g, ids in grams.items()}
+        words.sort()
+        self.words = [w for w, _ in words]
+        self.word_ids = np.array([vid for _, vid in words], dtype=np.int64)
+
+    def _alphabetical(self, ids: np.ndarray) -> np.ndarray:
+        ids = np.unique(ids)
+        return ids[np.argsort(self.alpha_rank[ids], kind="stable")]
+
+    def match(self, query: str) -> list[np.ndarray]:
+        # Groupes de valeurs par pertinence : début de la valeur, début d'un mot, puis sous-chaîne
+        lo = bisect.bisect_left(self.sorted_keys, query)
+        hi = bisect.bisect_left(self.sorted_keys, query + "\uffff")
+        prefix = self.sorted_ids[lo:hi]
+
+        # Valeurs déjà placées dans un groupe précédent
+        found = np.zeros(len(self.keys), dtype=bool)
+        found[prefix] = True
+
+        lo = bisect.bisect_left(self.words, query)
+        hi = bisect.bisect_left(self.words, query + "\uffff")
+        word = self.word_ids[lo:hi]
+        # Tri des positions alphabétiques puis doublons retirés (plusieurs mots d'une valeur peuvent commencer ainsi)
+        ranks = np.sort(self.alpha_rank[word[~found[word]]])
+        word = self.sorted_ids[ranks[np.r_[True, ranks[1:] != ranks[:-1]]]] if len(ranks) else ranks
+        found[word] = True
+        groups = [prefix, word]
+
+        if len(query) >= NGRAM:
+            postings = []
+            for gram in {query[i:i + NGRAM] for i in range(len(query) - NGRAM + 1)}:
+                postings.append(self.grams.get(gram, np.array([], dtype=np.int64)))
+            postings.sort(key=len)
+            ids = postings[0]
+            for other in postings[1:]:
+                ids = np.intersect1d(ids, other, assume_unique=True)
+            if len(query) > NGRAM:
+                # Les trigrammes ne garantissent pas l'ordre : vérification sur les candidats restants
+                ids = np.array([i for i in ids if query in self.keys[i]], dtype=np.int64)
+            groups.append(self._alphabetical(ids[~found[ids]]))
+        else:
+            # Requête plus courte qu'un trigramme : sa liste contient exactement les valeurs où elle apparaît
+            ids = self.grams.get(query, np.array([], dtype=np.int64))
+            groups.append(ids[~found[ids]])
+        return groups
+
+
+class PlayerSearchIndex:
+    def __init__(self, df: pd.DataFrame, fields: tuple[str, ...] = SEARCH_FIELDS):
+        self.df = df
+        self.fields = {f: _FieldIndex(df[f]) for f in fields if f in df.columns}
+        # Ordre alphabétique des joueurs, utilisé quand la recherche est vide
+        self._players = df["Player"].to_numpy()
+        self._alpha = np.argsort(np.array([normalize_text(p) for p in self._players]), kind="stable")
+
+    def search(self, query: str, field: str = "Player", limit: int = 50) -> tuple[np.ndarray, int]:
+        # Lignes triées par pertinence (au plus `limit`) et nombre total de lignes trouvées
+        query = normalize_text(query or "")
+        if not query:
+            return self._alpha[:limit], len(self._alpha)
+
+        index = self.fields[field]
+        groups = index.match(query)
+        total = int(sum(index.counts[ids].sum() for ids in groups))
+        rows = []
+        for vid in np.concatenate(groups):
+            if len(rows) >= limit:
+                break
+            value_rows = index.rows[vid]
+            if field != "Player":
+                value_rows = value_rows[np.argsort(self._players[value_rows], kind="stable")]
+            rows.extend(value_rows[:limit - len(rows)].tolist())
+        return np.array(rows, dtype=int), total
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler, normalize
+
+DEFAULT_FEATURES = ['Gls_90', 'Ast_90', 'xG_90', 'xAG_90']
+# Nombre maximal de scores (lignes x colonnes) calculés à la fois en mode batch
+BLOCK_CELLS = 1 << 24
+
+
+class SimilarityIndex:
+    # Une matrice standardisée et normalisée par poste : la similarité cosinus devient un produit scalaire
+    def __init__(self, df: pd.DataFrame, features: list[str] | None = None, group_col: str = "Pos"):
+        self.df = df
+        self.features = [f for f in (features or DEFAULT_FEATURES) if f in df.columns]
+        if not self.features:
+            raise ValueError("Aucune colonne de similarité présente dans le fichier.")
+        self.group_col = group_col
+        self._groups = []
+        # Pour chaque ligne du tableau : numéro de son groupe et position dans ce groupe
+        self._row_group = np.full(len(df), -1)
+        self._row_pos = np.zeros(len(df), dtype=int)
+
+        keys = df[group_col]
+        for rows in keys.groupby(keys, sort=False, observed=True).indices.values():
+            values = df[self.features].iloc[rows].to_numpy(dtype=np.float64)
+            scaled = np.nan_to_num(StandardScaler().fit_transform(values))
+            self._row_group[rows] = len(self._groups)
+            self._row_pos[rows] = np.arange(len(rows))
+            self._groups.append((rows, normalize(scaled).astype(np.float32)))
+
+    def _result(self, rows: np.ndarray, scores: np.ndarray) -> pd.DataFrame:
+        cols = [c for c in ["Player", "Squad", "Comp"] if c in self.df.columns]
+        out = self.df.iloc[rows][cols].copy()
+        out["similarity"] = scores.astype(np.float64)
+        return out
+
+    def similar(self, row: int, k: int = 5) -> pd.DataFrame:
+        if row is None or self._row_group[row] < 0:
+            return self._result(np.array([], dtype=int), np.array([]))
+        rows, matrix = self._groups[self._row_group[row]]
+        i = self._row_pos[row]
+        scores = matrix @ matrix[i]
+        scores[i] = -np.inf
+        k = min(k, len(rows) - 1)
+        if k <= 0:
+            return self._result(np.array([], dtype=int), np.array([]))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return self._result(rows[top], scores[top])
+
+    def all_top_k(self, k: int = 5) -> pd.DataFrame:
+        # Mode batch : k plus proches voisins de chaque joueur, par blocs de produits matriciels
+        sources, targets, ranks, scores = [], [], [], []
+        for rows, matrix in self._groups:
+            n = len(rows)
+            kk = min(k, n - 1)
+            if kk <= 0:
+                continue
+            block = max(1, BLOCK_CELLS // n)
+            for start in range(0, n, block):
+                stop = min(start + block, n)
+                sims = matrix[start:stop] @ matrix.T
+                sims[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+                top = np.argpartition(-sims, kk - 1, axis=1)[:, :kk]
+                top_scores = np.take_along_axis(sims, top, axis=1)
+                order = np.argsort(-top_scores, axis=1, kind="stable")
+                top = np.take_along_axis(top, order, axis=1)
+                top_scores = np.take_along_axis(top_scores, order, axis=1)
+                sources.append(np.repeat(rows[start:stop], kk))
+                targets.append(rows[top].ravel())
+                ranks.append(np.tile(np.arange(1, kk + 1), stop - start))
+                scores.append(top_scores.ravel())
+
+        if not sources:
+            return pd.DataFrame(columns=["Player", "Rang", "Joueur similaire", "similarity"])
+        sources, targets = np.concatenate(sources), np.concatenate(targets)
+        players = self.df["Player"].to_numpy()
+        return pd.DataFrame({
+            "Player": players[sources],
+            "Rang": np.concatenate(ranks),
+            "Joueur similaire": players[targets],
+            "similarity": np.concatenate(scores).astype(np.float64),
+        })
+
+    def export(self, path: str, k: int = 5) -> None:
+        self.all_top_k(k).to_csv(path, index=False)
@@ -0,0 +1,116 @@
+import glob
+import importlib.util
+import os
+import threading
+import time
+
+import pandas as pd
+
+from data.formats import _pyarrow, detect_format
+
+TABLE_NAME = "players"
+MAX_RESULT_ROWS = 10_000
+
+# Requêtes proposées dans le dashboard (colonnes à caractères spéciaux entre guillemets : "G+A")
+EXAMPLE_QUERIES = {
+    "Totaux par club": """SELECT Squad, Comp, COUNT(*) AS joueurs, SUM(Gls) AS buts, SUM(Ast) AS passes,
+       ROUND(SUM(xG), 1) AS xG
+FROM players
+GROUP BY ALL
+ORDER BY buts DESC
+LIMIT 20""",
+    "Efficacité xG par tranche d'âge": """SELECT FLOOR(Age / 3) * 3 AS tranche_age, COUNT(*) AS joueurs, SUM(Gls) AS buts,
+       ROUND(SUM(xG), 1) AS xG, ROUND(SUM(Gls) / NULLIF(SUM(xG), 0), 2) AS buts_par_xG
+FROM players
+WHERE Min >= 450
+GROUP BY ALL
+ORDER BY tranche_age""",
+    "Meilleurs G+A/90 par poste": """SELECT Pos, Player, Squad, "G+A_90"
+FROM players
+WHERE Min >= 900
+QUALIFY ROW_NUMBER() OVER (PARTITION BY Pos ORDER BY "G+A_90" DESC) <= 3
+ORDER BY Pos, "G+A_90" DESC""",
+}
+
+
+def has_duckdb() -> bool:
+    return importlib.util.find_spec("duckdb") is not None
+
+
+def _duckdb():
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError("Les requêtes SQL nécessitent duckdb (pip install duckdb)") from e
+    return duckdb
+
+
+class SqlEngine:
+    # Moteur SQL en colonnes (DuckDB, en mémoire) sur le tableau nettoyé : DuckDB lit directement
+    # les colonnes du DataFrame, d'un fichier Parquet ou d'une table Arrow, et répartit chaque requête
+    # sur tous les cœurs. Lecture seule : une seule instruction SELECT par requête, pas d'accès aux fichiers.
+    def __init__(self, df: pd.DataFrame | None = None, path: str | None = None,
+                 threads: int | None = None, table: str = TABLE_NAME):
+        if (df is None) == (path is None):
+            raise ValueError("Indiquer soit un DataFrame, soit un chemin de fichier.")
+        duckdb = _duckdb()
+        self.table = table
+        self._con = duckdb.connect(":memory:", config={"threads": threads or os.cpu_count() or 1})
+        if df is not None:
+            self._con.register(table, df)
+        else:
+            self._attach(path)
+        self._con.execute("SET enable_external_access = false")
+        self._con.execute("SET lock_configuration = true")
+        # Une connexion DuckDB ne se partage pas entre threads : requêtes en série, chacune parallélisée
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_path(cls, path: str, **kwargs) -> "SqlEngine":
+        return cls(path=path, **kwargs)
+
+    def _attach(self, path: str) -> None:
+        fmt = detect_format(path)
+        if fmt == "arrow":
+            # Fichier projeté en mémoire : DuckDB parcourt la table Arrow sans la copier
+            pa = _pyarrow()
+            self._con.register(self.table, pa.ipc.open_file(pa.memory_map(path, "r")).read_all())
+            return
+        reader = "read_parquet" if fmt == "parquet" else "read_csv_auto"
+        # Motif glob développé ici : la liste exacte des fichiers est connue avant de couper l'accès aux fichiers
+        files = sorted(glob.glob(path)) or [path]
+        quoted = ", ".join("'" + os.path.abspath(f).replace("'", "''") + "'" for f in files)
+        self._con.execute(f"CREATE VIEW {self.table} AS SELECT * FROM {reader}([{quoted}])")
+        # Seuls ces fichiers restent lisibles, pas le reste de leur dossier
+        self._con.execute(f"SET allowed_paths = [{quoted}]")
+
+    def _check(self, sql: str) -> str:
+        duckdb = _duckdb()
+        statements = duckdb.extract_statements(sql)
+        if len(statements) != 1:
+            raise ValueError("Une seule requête à la fois.")
+        if statements[0].type != duckdb.StatementType.SELECT:
+            raise ValueError("Seules les requêtes de lecture (SELECT, WITH, DESCRIBE, SUMMARIZE) sont acceptées.")
+        return statements[0].query
+
+    def query(self, sql: str, params: list | dict | None = None, limit: int | None = MAX_RESULT_ROWS) -> pd.DataFrame:
+        # Résultat tronqué à `limit` lignes ; attrs : durée et troncature
+        sql = self._check(sql)
+        start = time.perf_counter()
+        with self._lock:
+            relation = self._con.sql(sql, params=params)
+            if limit is not None:
+                relation = relation.limit(limit + 1)
+            result = relation.df()
+        truncated = limit is not None and len(result) > limit
+        if truncated:
+            result = result.iloc[:limit]
+        result.attrs.update(seconds=time.perf_counter() - start, truncated=truncated)
+        return result
+
+    def columns(self) -> pd.DataFrame:
+        with self._lock:
+            return self._con.sql(f"DESCRIBE {self.table}").df()[["column_name", "column_type"]]
+
+    def close(self) -> None:
+        self._con.close()
@@ -0,0 +1,152 @@
+import math
+import os
+import pickle
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from data.formats import TableWriter
+from data.verify_data import (
+    MISSING_VALUES,
+    _apply_corrections,
+    _convert_numeric,
+    _drop_duplicates,
+    _handle_missing,
+    _handle_outliers,
+)
+
+# Nombre de lignes lues pour estimer la taille d'une ligne en mémoire
+SAMPLE_ROWS = 1000
+# Marge entre la taille brute d'un bloc et la mémoire réellement utilisée pendant son nettoyage
+WORKING_FACTOR = 4
+
+
+# ------------------| Estimation du découpage |------------------
+def _plan_chunks(input_path: str, memory_limit_mb: float) -> tuple[int, int]:
+    budget = memory_limit_mb * 1024 * 1024
+    sample = pd.read_csv(input_path, nrows=SAMPLE_ROWS)
+    if len(sample) == 0:
+        return SAMPLE_ROWS, 1
+
+    row_bytes = max(sample.memory_usage(deep=True).sum() / len(sample), 1)
+    with open(input_path, "rb") as f:
+        for _ in range(len(sample) + 1):
+            f.readline()
+        sample_disk_bytes = max(f.tell(), 1)
+
+    estimated_rows = os.path.getsize(input_path) * len(sample) / sample_disk_bytes
+    chunksize = max(int(budget / (row_bytes * WORKING_FACTOR)), 1)
+    n_partitions = max(math.ceil(estimated_rows * row_bytes * WORKING_FACTOR / budget), 1)
+    return chunksize, n_partitions
+
+
+def _partition_keys(chunk: pd.DataFrame) -> np.ndarray:
+    # Les doublons exacts partagent le même joueur : partitionner sur Player suffit pour les deux dédoublonnages
+    cols = ["Player"] if "Player" in chunk.columns else list(chunk.columns)
+    key = chunk[cols].copy()
+    for c in cols:
+        if pd.api.types.is_numeric_dtype(key[c]):
+            key[c] = key[c].astype("float64")
+        else:
+            key[c] = key[c].astype(object).where(key[c].notna(), "")
+    return pd.util.hash_pandas_object(key, index=False).to_numpy()
+
+
+def _read_partition(path: str) -> pd.DataFrame:
+    pieces = []
+    with open(path, "rb") as f:
+        while True:
+            try:
+                pieces.append(pickle.load(f))
+            except EOFError:
+                break
+    return pd.concat(pieces, ignore_index=True)
+
+
+def _harmonize_dtypes(df: pd.DataFrame, float_cols: set, text_cols: set) -> pd.DataFrame:
+    # Une colonne entière dans un bloc mais décimale dans un autre est décimale dans tout le fichier ;
+    # une colonne texte vide dans un bloc (lue en float64) reste texte : le schéma Parquet/Arrow du premier bloc
+    # s'applique aux suivants
+    for c in float_cols & set(df.columns):
+        if pd.api.types.is_integer_dtype(df[c]):
+            df[c] = df[c].astype("float64")
+    for c in text_cols & set(df.columns):
+        if pd.api.types.is_numeric_dtype(df[c]) or pd.api.types.is_bool_dtype(df[c]):
+            df[c] = df[c].astype("str")
+    return df
+
+
+# ----------------------| Nettoyage par blocs |------------------
+def clean_csv_chunked(input_path: str, output_path: str, memory_limit_mb: float = 512,
+                      tmp_dir: str | None = None, verbose: bool = True) -> dict:
+    errors = []
+    chunksize, n_partitions = _plan_chunks(input_path, memory_limit_mb)
+    rows_in = rows_out = 0
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as spill_dir:
+        paths = [os.path.join(spill_dir, f"part-{i}.pkl") for i in range(n_partitions)]
+
+        # Passe 1 : conversion numérique ligne à ligne et répartition par joueur sur disque
+        columns = None
+        for chunk in pd.read_csv(input_path, chunksize=chunksize):
+            if columns is None:
+                columns = list(chunk.columns)
+            rows_in += len(chunk)
+            chunk = _convert_numeric(chunk, errors, verbose=False)
+            parts = _partition_keys(chunk) % n_partitions
+            for i in np.unique(parts):
+                with open(paths[i], "ab") as f:
+                    pickle.dump(chunk[parts == i], f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        # Passe 2 : doublons et étapes ligne à ligne, une partition à la fois
+        non_empty = set()
+        dtype_kinds = {}
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            df = _read_partition(path)
+            df = _drop_duplicates(df, errors, verbose=False)
+            filled = df.notna()
+            for c in df.select_dtypes(include=["object"]).columns:
+                filled[c] &= ~df[c].isin(MISSING_VALUES)
+            non_empty.update(filled.columns[filled.any()])
+            df = _handle_missing(df, errors, verbose=False, drop_empty=False)
+            df = _handle_outliers(df, errors, verbose=False)
+            df = _apply_corrections(df, errors, verbose=False)
+            for c in df.columns:
+                dtype_kinds.setdefault(c, set()).add(df[c].dtype.kind)
+            with open(path, "wb") as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        # Passe 3 : suppression des colonnes vides, types communs et écriture progressive
+        float_cols = {c for c, kinds in dtype_kinds.items() if "f" in kinds and kinds & {"i", "u"}}
+        text_cols = {c for c, kinds in dtype_kinds.items() if kinds & {"O", "U", "S"} and kinds - {"O", "U", "S"}}
+        empty_cols = [c for c in (columns or []) if c not in non_empty]
+        if empty_cols and verbose:
+            print("Colonnes entièrement vides supprimées :", empty_cols)
+
+        # Sortie CSV, Parquet ou Arrow selon l'extension de output_path
+        with TableWriter(output_path) as writer:
+            written = False
+            for path in paths:
+                if not os.path.exists(path):
+                    continue
+                df = _read_partition(path).drop(columns=empty_cols, errors="ignore")
+                df = _harmonize_dtypes(df, float_cols, text_cols)
+                writer.write(df)
+                written = True
+                rows_out += len(df)
+
+            if not written and columns is not None:
+                writer.write(pd.DataFrame(columns=[c for c in columns if c not in empty_cols]))
+
+    if verbose:
+        print("Lignes lues :", rows_in, "- lignes écrites :", rows_out)
+    return {
+        "rows_in": rows_in,
+        "rows_out": rows_out,
+        "chunksize": chunksize,
+        "partitions": n_partitions,
+        "errors": list(dict.fromkeys(errors)),
+    }
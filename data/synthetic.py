@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+
+from data.verify_data import RECORD_LIMITS
+
+COLUMNS = [
+    'Rk','Player','Nation','Pos','Squad','Comp','Age','Born','MP','Starts','Min','90s',
+    'Gls','Ast','G+A','G-PK','PK','PKatt','CrdY','CrdR','xG','npxG','xAG','npxG+xAG',
+    'PrgC','PrgP','PrgR','Gls_90','Ast_90','G+A_90','G-PK_90','G+A-PK_90','xG_90',
+    'xAG_90','xG+xAG_90','npxG_90','npxG+xAG_90'
+]
+
+COMPETITIONS = ['eng Premier League', 'es La Liga', 'de Bundesliga', 'it Serie A', 'fr Ligue 1']
+POSITIONS = ['GK', 'DF', 'MF', 'FW', 'DF,MF', 'MF,FW', 'FW,MF', 'DF,FW', 'MF,DF']
+POSITION_WEIGHTS = [0.08, 0.3, 0.22, 0.16, 0.06, 0.08, 0.06, 0.02, 0.02]
+# Buts attendus par 90 minutes selon le poste
+POSITION_XG = {'GK': 0.0, 'DF': 0.04, 'MF': 0.12, 'FW': 0.38, 'DF,MF': 0.06,
+               'MF,FW': 0.25, 'FW,MF': 0.3, 'DF,FW': 0.15, 'MF,DF': 0.08}
+NATIONS = ['fr FRA', 'eng ENG', 'es ESP', 'de GER', 'it ITA', 'br BRA', 'ar ARG', 'pt POR',
+           'nl NED', 'be BEL', 'ma MAR', 'sn SEN', 'us USA', 'dk DEN', 'hr CRO', 'ci CIV']
+FIRST_NAMES = ['Kylian', 'Erling', 'Jérôme', 'Antoine', 'Rúben', 'Luka', 'Mohamed', 'Thiago',
+               'Søren', 'Ousmane', 'João', 'Björn', 'Iñaki', 'Lucas', 'Hakim', 'Ángel', 'Max']
+LAST_NAMES = ['Mbappé', 'Haaland', 'Boateng', 'Griezmann', 'Dias', 'Modrić', 'Salah', 'Silva',
+              'Dembélé', 'Félix', 'Müller', 'Williams', 'Hernández', 'Ziyech', 'Di María', 'Kane']
+DIRTY_VALUES = ['1,234', '-', '', '23-145', 'N/A']
+DIRTY_COLS = ['MP', 'Min', 'Gls', 'Ast', 'xG', 'PrgP', 'Gls_90', 'Age']
+
+
+def generate_players(n_rows: int, seed: int = 0, duplicate_rate: float = 0.02,
+                     dirty_rate: float = 0.01, outlier_rate: float = 0.001) -> pd.DataFrame:
+    # Joueurs synthétiques au format du CSV attendu, avec doublons, valeurs sales et valeurs aberrantes
+    rng = np.random.default_rng(seed)
+    n_unique = max(n_rows - int(n_rows * duplicate_rate), 1)
+
+    first = rng.choice(FIRST_NAMES, n_unique)
+    last = rng.choice(LAST_NAMES, n_unique)
+    ids = np.arange(n_unique).astype(str)
+    player = np.char.add(np.char.add(np.char.add(first.astype(str), " "), last.astype(str)), np.char.add(" ", ids))
+
+    comp_idx = rng.integers(0, len(COMPETITIONS), n_unique)
+    comp = np.array(COMPETITIONS)[comp_idx]
+    squad = np.char.add(np.char.add(np.array([c.split(" ", 1)[1] for c in COMPETITIONS])[comp_idx], " Club "),
+                        rng.integers(1, 21, n_unique).astype(str))
+    pos = rng.choice(POSITIONS, n_unique, p=POSITION_WEIGHTS)
+
+    age = rng.integers(16, 39, n_unique)
+    mp = rng.integers(1, 39, n_unique)
+    starts = np.minimum(rng.binomial(mp, 0.6), mp)
+    minutes = starts * rng.integers(60, 91, n_unique) + (mp - starts) * rng.integers(1, 30, n_unique)
+    nineties = np.round(minutes / 90, 1)
+
+    xg_rate = np.vectorize(POSITION_XG.get)(pos)
+    xg = np.round(rng.gamma(2.0, xg_rate * nineties / 2 + 1e-9), 1)
+    gls = rng.poisson(xg)
+    pkatt = rng.binomial(gls + 1, 0.1)
+    pk = rng.binomial(pkatt, 0.78)
+    gls = np.maximum(gls, pk)
+    xag = np.round(rng.gamma(2.0, (xg_rate * 0.6 + 0.03) * nineties / 2 + 1e-9), 1)
+    ast = rng.poisson(xag)
+    npxg = np.round(np.maximum(xg - pkatt * 0.76, 0), 1)
+
+    df = pd.DataFrame({
+        'Rk': np.arange(1, n_unique + 1),
+        'Player': player,
+        'Nation': rng.choice(NATIONS, n_unique),
+        'Pos': pos,
+        'Squad': squad,
+        'Comp': comp,
+        'Age': age,
+        'Born': 2024 - age,
+        'MP': mp,
+        'Starts': starts,
+        'Min': minutes,
+        '90s': nineties,
+        'Gls': gls,
+        'Ast': ast,
+        'G+A': gls + ast,
+        'G-PK': gls - pk,
+        'PK': pk,
+        'PKatt': pkatt,
+        'CrdY': rng.poisson(0.15 * nineties),
+        'CrdR': rng.binomial(1, 0.05, n_unique),
+        'xG': xg,
+        'npxG': npxg,
+        'xAG': xag,
+        'npxG+xAG': np.round(npxg + xag, 1),
+        'PrgC': rng.poisson(1.5 * nineties),
+        'PrgP': rng.poisson(3.0 * nineties),
+        'PrgR': rng.poisson(2.5 * nineties),
+    })
+    safe_90s = np.where(nineties > 0, nineties, np.nan)
+    for name, num in [('Gls_90', gls), ('Ast_90', ast), ('G+A_90', gls + ast), ('G-PK_90', gls - pk),
+                      ('G+A-PK_90', gls + ast - pk), ('xG_90', xg), ('xAG_90', xag),
+                      ('xG+xAG_90', xg + xag), ('npxG_90', npxg), ('npxG+xAG_90', npxg + xag)]:
+        df[name] = np.round(np.nan_to_num(num / safe_90s), 2)
+
+    # Valeurs aberrantes au-dessus des records connus
+    n_out = int(n_unique * outlier_rate)
+    for col, vmax in RECORD_LIMITS.items():
+        rows = rng.integers(0, n_unique, n_out)
+        df.loc[rows, col] = vmax + rng.integers(1, 50, n_out)
+
+    # Doublons : copies exactes et mêmes joueurs avec moins de minutes
+    n_dup = n_rows - n_unique
+    if n_dup > 0:
+        dups = df.iloc[rng.integers(0, n_unique, n_dup)].copy()
+        partial = rng.random(n_dup) < 0.5
+        dups.loc[partial, 'Min'] = (dups.loc[partial, 'Min'] * 0.5).astype(int)
+        df = pd.concat([df, dups], ignore_index=True)
+        df = df.iloc[rng.permutation(len(df))].reset_index(drop=True)
+
+    # Cellules sales, comme dans les exports bruts
+    for col in DIRTY_COLS:
+        rows = np.flatnonzero(rng.random(len(df)) < dirty_rate)
+        if len(rows):
+            df[col] = df[col].astype(object)
+            df.loc[rows, col] = rng.choice(DIRTY_VALUES, len(rows))
+
+    return df[COLUMNS]
+
+
+def write_players_csv(path: str, n_rows: int, seed: int = 0, chunk_rows: int = 1_000_000, **kwargs) -> None:
+    # Écriture par blocs pour les très gros volumes (jusqu'à plusieurs millions de lignes)
+    written = 0
+    block = 0
+    while written < n_rows:
+        size = min(chunk_rows, n_rows - written)
+        chunk = generate_players(size, seed=seed + block, **kwargs)
+        chunk['Player'] = chunk['Player'] + f"-{block}"
+        chunk['Rk'] = chunk['Rk'] + written
+        chunk.to_csv(path, index=False, header=written == 0, mode="w" if written == 0 else "a")
+        written += size
+        block += 1
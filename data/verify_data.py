@@ -1,31 +1,92 @@
-from turtle import st
 import pandas as pd
 import numpy as np
 
-def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
-
-    errors = []
+from data.formats import read_table, write_table
+from data.instrumentation import run_stage
+
+NUMBER_PATTERN = r"(\d+\.?\d*)"
+
+# ------------------| Conversion numérique |------------------
+def _extract_number(series: pd.Series) -> pd.Series:
+    # Chemin historique : premier nombre trouvé dans la représentation texte (signe ignoré)
+    return pd.to_numeric(series.astype(str).str.extract(NUMBER_PATTERN)[0], errors="coerce")
+
+def coerce_numeric(series: pd.Series) -> pd.Series:
+    # Mêmes valeurs que _extract_number, mais seules les cellules « sales » passent par la regex
+    if len(series) == 0:
+        return _extract_number(series)
+
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "iu" and not (dtype.kind == "u" and dtype.itemsize == 8):
+        values = series.to_numpy()
+        if dtype != np.int64 or values.min() > np.iinfo(np.int64).min:
+            return pd.Series(np.abs(values.astype(np.int64)), index=series.index, name=series.name)
+
+    if isinstance(dtype, np.dtype) and dtype.kind == "f":
+        values = series.to_numpy()
+        magnitude = np.abs(values)
+        # Seules les décimales courtes (2 chiffres après la virgule au plus) sont relues à l'identique par to_numeric ;
+        # le reste (0.1 + 0.2, float32, notation scientifique) repasse par le texte comme avant
+        short = np.isnan(values)
+        if dtype == np.float64:
+            short |= (magnitude < 1e13) & (np.rint(magnitude * 100) / 100 == magnitude)
+        result = magnitude.astype(np.float64)
+        if not short.all():
+            result[~short] = _coerce_text(pd.Series(magnitude[~short])).to_numpy(dtype=np.float64)
+        return pd.Series(result, index=series.index, name=series.name)
+
+    return _coerce_text(series)
+
+def _coerce_text(series: pd.Series) -> pd.Series:
+    text = series.astype(str).reset_index(drop=True)
+    plain = text.str.isdecimal()
+    if not plain.all():
+        plain[~plain] = text[~plain].str.fullmatch(NUMBER_PATTERN, na=False)
+    parts = []
+    if plain.any():
+        parts.append(pd.to_numeric(text[plain], errors="coerce"))
+    if not plain.all():
+        parts.append(_extract_number(text[~plain]))
+    result = pd.concat(parts).sort_index()
+    result.index = series.index
+    result.name = series.name
+    return result
+
+NUMERIC_COLS = [
+    'MP','Starts','Min','90s','Gls','Ast','G+A','G-PK','PK','PKatt','CrdY','CrdR',
+    'xG','npxG','xAG','npxG+xAG','PrgC','PrgP','PrgR','Gls_90','Ast_90','G+A_90',
+    'G-PK_90','G+A-PK_90','xG_90','xAG_90','xG+xAG_90','npxG_90','npxG+xAG_90','Age'
+]
+
+MISSING_VALUES = ["", "-"]
+
+RECORD_LIMITS = {
+    "Age": 40,
+    "Gls": 73,
+    "Ast": 21,
+    "G+A": 80,
+    "CrdY": 17,
+    "xG": 34,
+}
+
+CATEGORY_COLS = ['Nation', 'Pos', 'Squad', 'Comp', 'Season', 'Source']
 
 # ------------------| Colonnes numériques à forcer |------------------
+def _convert_numeric(df: pd.DataFrame, errors: list, verbose: bool = True) -> pd.DataFrame:
     try:
-        numeric_cols = [
-            'MP','Starts','Min','90s','Gls','Ast','G+A','G-PK','PK','PKatt','CrdY','CrdR',
-            'xG','npxG','xAG','npxG+xAG','PrgC','PrgP','PrgR','Gls_90','Ast_90','G+A_90',
-            'G-PK_90','G+A-PK_90','xG_90','xAG_90','xG+xAG_90','npxG_90','npxG+xAG_90','Age'
-        ]
-        for col in [c for c in numeric_cols if c in df.columns]:
-            df[col] = pd.to_numeric(
-                df[col].astype(str).str.extract(r"(\d+\.?\d*)")[0],
-                errors="coerce"
-            )
+        for col in [c for c in NUMERIC_COLS if c in df.columns]:
+            df[col] = coerce_numeric(df[col])
     
     except Exception as e:
         errors.append(f"Erreur lors de la conversion numérique : {e}")
+    return df
 
 # ------------------| Doublons |------------------
+def _drop_duplicates(df: pd.DataFrame, errors: list, verbose: bool = True) -> pd.DataFrame:
     try:
         dup_exact = df.duplicated().sum()
-        print("Doublons exacts :", dup_exact)
+        if verbose:
+            print("Doublons exacts :", dup_exact)
 
         df = df.drop_duplicates().reset_index(drop=True)
 
@@ -33,25 +94,32 @@ def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
             if col in df.columns:
                 df[col] = pd.to_numeric(df[col], errors="coerce")
         if all(c in df.columns for c in ["Player", "Min", "MP"]):
+            # Plusieurs saisons fusionnées : un joueur garde une ligne par saison
+            keys = ["Player"] + (["Season"] if "Season" in df.columns else [])
             df = (
-                df.sort_values(["Player", "Min", "MP"], ascending=[True, False, False])
-                .drop_duplicates(subset=["Player"], keep="first")
+                df.sort_values(keys + ["Min", "MP"], ascending=[True] * len(keys) + [False, False])
+                .drop_duplicates(subset=keys, keep="first")
                 .reset_index(drop=True)
             )
-            print("Après déduplication par joueur :", df.shape)
+            if verbose:
+                print("Après déduplication par joueur :", df.shape)
     
     except Exception as e:
         errors.append(f"Erreur lors de la gestion des doublons : {e}")
+    return df
 
 # ------------------| Valeurs manquantes |------------------
+def _handle_missing(df: pd.DataFrame, errors: list, verbose: bool = True, drop_empty: bool = True) -> pd.DataFrame:
     try:
         for c in df.select_dtypes(include=["object"]).columns:
-            df[c] = df[c].replace({"": np.nan, "-": np.nan}).astype(object)
+            df[c] = df[c].replace({v: np.nan for v in MISSING_VALUES}).astype(object)
 
-        empty_cols = df.columns[df.isna().all()].tolist()
-        if empty_cols:
-            print("Colonnes entièrement vides supprimées :", empty_cols)
-            df = df.drop(columns=empty_cols)
+        if drop_empty:
+            empty_cols = df.columns[df.isna().all()].tolist()
+            if empty_cols:
+                if verbose:
+                    print("Colonnes entièrement vides supprimées :", empty_cols)
+                df = df.drop(columns=empty_cols)
 
         for c in ["Gls", "Ast", "MP", "Min"]:
             if c in df.columns:
@@ -60,30 +128,25 @@ def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     
     except Exception as e:
         errors.append(f"Erreur lors de la gestion des valeurs manquantes : {e}")
+    return df
 
 # ------------------| Valeurs aberrantes |------------------
+def _handle_outliers(df: pd.DataFrame, errors: list, verbose: bool = True) -> pd.DataFrame:
     try:
-        record_limits = {
-            "Age": 40,
-            "Gls": 73,
-            "Ast": 21,
-            "G+A": 80,
-            "CrdY": 17,
-            "xG": 34,
-        }
-
-        for col, vmax in record_limits.items():
+        for col, vmax in RECORD_LIMITS.items():
             if col in df.columns:
                 df[col] = pd.to_numeric(df[col], errors="coerce")
                 nb_out = (df[col] > vmax).sum()
-                if nb_out:
+                if nb_out and verbose:
                     print(f"Outliers (>{vmax}) pour {col} :", int(nb_out))
                 df[col] = df[col].clip(upper=vmax)
     
     except Exception as e:
         errors.append(f"Erreur lors de la gestion des valeurs aberrantes : {e}")
+    return df
 
 # ------------------| Corrections évidentes |------------------
+def _apply_corrections(df: pd.DataFrame, errors: list, verbose: bool = True) -> pd.DataFrame:
     try:
         for c in ["Gls", "Ast", "MP", "Min"]:
             if c in df.columns:
@@ -94,26 +157,86 @@ def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     
     except Exception as e:
         errors.append(f"Erreur lors des corrections évidentes : {e}")
+    return df
+
+# ------------------| Représentation compacte |------------------
+def _compact(df: pd.DataFrame, errors: list, verbose: bool = True) -> pd.DataFrame:
+    try:
+        before = int(df.memory_usage(deep=True).sum())
+
+        for c in [c for c in CATEGORY_COLS if c in df.columns]:
+            # Une catégorie n'est rentable que si les valeurs se répètent
+            if df[c].nunique(dropna=True) < 0.5 * len(df):
+                df[c] = df[c].astype("category")
+
+        for c in df.select_dtypes(include="number").columns:
+            col = df[c]
+            if col.notna().all() and (col % 1 == 0).all():
+                df[c] = pd.to_numeric(col.astype(np.int64), downcast="integer")
+            elif pd.api.types.is_float_dtype(col):
+                df[c] = col.astype(np.float32)
+
+        after = int(df.memory_usage(deep=True).sum())
+        df.attrs["memory"] = {"before": before, "after": after, "saved": before - after}
+        if verbose:
+            print(f"Mémoire : {before / 1e6:.1f} Mo -> {after / 1e6:.1f} Mo")
+    
+    except Exception as e:
+        errors.append(f"Erreur lors de la compaction : {e}")
+    return df
+
+STAGES = [
+    ("conversion_numerique", _convert_numeric),
+    ("doublons", _drop_duplicates),
+    ("valeurs_manquantes", _handle_missing),
+    ("valeurs_aberrantes", _handle_outliers),
+    ("corrections", _apply_corrections),
+]
+COMPACT_STAGE = ("compaction", _compact)
+
+def clean_dataframe(df: pd.DataFrame, compact: bool = False, on_stage=None, memory: str | None = "rss",
+                    verbose: bool = True) -> pd.DataFrame:
+
+    errors = []
+    stages = []
+
+    # Chaque étape est mesurée : durée, lignes en entrée/sortie, colonnes modifiées, pic mémoire
+    for name, stage in STAGES + ([COMPACT_STAGE] if compact else []):
+        df, record = run_stage(name, stage, df, errors, memory=memory, on_stage=on_stage, verbose=verbose)
+        stages.append(record)
 
     df.attrs["errors"] = errors
+    df.attrs["stages"] = stages
     
     return df
 
 # ----------------------| Sauvegarde |------------------
-def clean_csv(input_path: str, output_path: str) -> None:
+def clean_csv(input_path: str, output_path: str, memory_limit_mb: float | None = None) -> None:
     try:
-        df = pd.read_csv(input_path)
+        if memory_limit_mb is not None:
+            # Lecture par blocs : la mémoire maximale dépend du budget, pas de la taille du fichier
+            from data.streaming import clean_csv_chunked
+
+            summary = clean_csv_chunked(input_path, output_path, memory_limit_mb=memory_limit_mb)
+            print("Fichier nettoyé :", output_path)
+            if summary["errors"]:
+                print("Problèmes rencontrés :")
+                for err in summary["errors"]:
+                    print(" -", err)
+            return
+
+        # Entrée et sortie CSV, Parquet ou Arrow selon l'extension ; les types nettoyés sont conservés en Parquet/Arrow
+        df = read_table(input_path)
 
         df = clean_dataframe(df)
 
-        df.to_csv(output_path, index=False)
+        write_table(df, output_path)
         print("Fichier nettoyé :", output_path)
 
         if df.attrs.get("errors"):
             print("Problèmes rencontrés :")
             for err in df.attrs["errors"]:
                 print(" -", err)
-                st.warning(err)
                 
     except Exception as e:
         print(f"Erreur générale : {e}")
\ No newline at end of file
@@ -0,0 +1,59 @@
+import os
+
+import pandas as pd
+import pytest
+
+from data.batch import EXIT_OK, run_batch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(ROOT, "top5-players.csv")
+
+
+@pytest.fixture(scope="module")
+def sample():
+    return pd.read_csv(SOURCE, nrows=50)
+
+
+def _write(sample: pd.DataFrame, path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sample.to_csv(path, index=False)
+
+
+def _statuses(results: list[dict]) -> dict:
+    return {os.path.basename(r["file"]): r["status"] for r in results}
+
+
+def test_layout_is_stable_when_tree_grows(tmp_path, sample):
+    exports, out = tmp_path / "exports", tmp_path / "out"
+    _write(sample, exports / "2023" / "a.csv")
+    results, code = run_batch([str(exports)], str(out), jobs=1)
+    assert code == EXIT_OK
+    assert (out / "2023" / "a.csv").exists()
+
+    _write(sample, exports / "2024" / "b.csv")
+    results, code = run_batch([str(exports)], str(out), jobs=1)
+    assert _statuses(results) == {"a.csv": "skipped", "b.csv": "ok"}
+    assert (out / "2024" / "b.csv").exists()
+    assert not (out / "a.csv").exists()
+
+
+def test_glob_layout_starts_at_glob_root(tmp_path, sample):
+    exports, out = tmp_path / "exports", tmp_path / "out"
+    _write(sample, exports / "2023" / "a.csv")
+    run_batch([str(exports / "**" / "*.csv")], str(out), jobs=1)
+    assert (out / "2023" / "a.csv").exists()
+
+
+def test_output_dir_inside_inputs_is_not_cleaned_again(tmp_path, sample):
+    exports = tmp_path / "exports"
+    out = exports / "clean"
+    _write(sample, exports / "a.csv")
+    _write(sample, out / ".tmp-1-x.csv")
+    for _ in range(3):
+        results, code = run_batch([str(exports)], str(out), jobs=1)
+        assert code == EXIT_OK
+        assert [os.path.basename(r["file"]) for r in results] == ["a.csv"]
+    assert not (out / "clean").exists()
+
+    results, _ = run_batch([str(exports / "**" / "*.csv")], str(out), jobs=1)
+    assert _statuses(results) == {"a.csv": "skipped"}
@@ -0,0 +1,36 @@
+import os
+
+import pandas as pd
+import pytest
+
+from data.ingest import detect_season, load_files
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(ROOT, "top5-players.csv")
+
+
+@pytest.mark.parametrize("name, season", [
+    ("players_2023-24.csv", "2023-2024"),
+    ("exports/top5 2023_2024.parquet", "2023-2024"),
+    ("saison_1999-00.csv", "1999-2000"),
+    ("ligue1.csv", None),
+    ("20240115-1030.csv", None),
+    ("export_2024-01-15.csv", None),
+    ("players_2023-2025.csv", None),
+])
+def test_detect_season(name, season):
+    assert detect_season(name) == season
+
+
+def test_files_without_season_keep_only_source(tmp_path):
+    sample = pd.read_csv(SOURCE, nrows=200)
+    paths = []
+    for name, rows in [("ligue1.csv", sample.iloc[:120]), ("premier.csv", sample.iloc[80:])]:
+        paths.append(str(tmp_path / name))
+        rows.to_csv(paths[-1], index=False)
+
+    df, _ = load_files([(path, path) for path in paths], jobs=1)
+    assert "Season" not in df.columns
+    assert set(df["Source"]) == {"ligue1.csv", "premier.csv"}
+    # Lignes communes aux deux fichiers : une seule ligne par joueur
+    assert not df["Player"].duplicated().any()
@@ -0,0 +1,46 @@
+import os
+
+import pandas as pd
+import pytest
+
+from data.search import PlayerSearchIndex, normalize_text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(ROOT, "top5-players.csv")
+
+
+@pytest.fixture(scope="module")
+def players():
+    return pd.read_csv(SOURCE)
+
+
+@pytest.fixture(scope="module")
+def index(players):
+    return PlayerSearchIndex(players)
+
+
+@pytest.mark.parametrize("field", ["Player", "Squad", "Nation"])
+@pytest.mark.parametrize("query", ["k", "ki", "al", "é", "mbap", "ate", "zzz"])
+def test_total_matches_contains(players, index, field, query):
+    # Même nombre de lignes qu'un str.contains sur le texte normalisé, quelle que soit la longueur de la requête
+    normalized = players[field].map(normalize_text)
+    expected = normalized.str.contains(normalize_text(query), regex=False)
+    rows, total = index.search(query, field, limit=len(players))
+    assert total == int(expected.sum())
+    assert sorted(rows.tolist()) == sorted(expected[expected].index.tolist())
+
+
+@pytest.mark.parametrize("query", ["k", "ki", "kil"])
+def test_short_queries_keep_ranking(query):
+    # Début de valeur, puis début d'un autre mot, puis sous-chaîne ; ordre alphabétique dans chaque groupe
+    names = ["Kilian Ali", "Ali Kiki", "Bakir Kim", "Kim Ba", "Oskil Ka", "Zak Ok"]
+    index = PlayerSearchIndex(pd.DataFrame({"Player": names, "Squad": "x", "Nation": "y"}))
+    keys = [normalize_text(n) for n in names]
+    groups = [
+        sorted(k for k in keys if k.startswith(query)),
+        sorted(k for k in keys if not k.startswith(query) and any(w.startswith(query) for w in k.split()[1:])),
+    ]
+    groups.append(sorted(k for k in keys if query in k and all(k not in g for g in groups)))
+    rows, total = index.search(query, limit=10)
+    assert [keys[row] for row in rows] == [k for g in groups for k in g]
+    assert total == sum(len(g) for g in groups)
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+from data.sql import SqlEngine  # noqa: E402
+
+
+@pytest.fixture
+def players():
+    return pd.DataFrame({"Player": ["A", "B", "C"], "Comp": ["x", "x", "y"], "Gls": [1, 2, 3]})
+
+
+def _assert_blocked(engine: SqlEngine, sql: str) -> None:
+    with pytest.raises(Exception):
+        engine.query(sql)
+
+
+def test_query_on_dataframe(players):
+    result = SqlEngine(players).query("SELECT Comp, SUM(Gls) AS buts FROM players GROUP BY Comp ORDER BY Comp")
+    assert result["buts"].tolist() == [3, 3]
+
+
+@pytest.mark.parametrize("statement", ["DROP VIEW players", "SELECT 1; SELECT 2", "SET threads = 1"])
+def test_only_single_select(players, statement):
+    with pytest.raises(ValueError):
+        SqlEngine(players).query(statement)
+
+
+def test_path_source_exposes_only_that_file(tmp_path, players):
+    source = tmp_path / "c.csv"
+    players.to_csv(source, index=False)
+    sibling = tmp_path / "big.csv"
+    players.to_csv(sibling, index=False)
+
+    engine = SqlEngine.from_path(str(source))
+    assert engine.query("SELECT COUNT(*) AS n FROM players")["n"].iat[0] == 3
+    _assert_blocked(engine, f"SELECT COUNT(*) FROM read_csv_auto('{sibling}')")
+    _assert_blocked(engine, "SELECT * FROM read_csv('/etc/passwd')")
+
+
+def test_dataframe_source_has_no_file_access(players):
+    _assert_blocked(SqlEngine(players), "SELECT * FROM read_csv('/etc/passwd')")
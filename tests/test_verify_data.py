@@ -0,0 +1,38 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.verify_data import NUMERIC_COLS, _extract_number, coerce_numeric
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(ROOT, "top5-players.csv")
+
+
+def _assert_same(series: pd.Series) -> None:
+    pd.testing.assert_series_equal(coerce_numeric(series), _extract_number(series), check_exact=True, check_names=False)
+
+
+@pytest.mark.parametrize("dtype", [None, str])
+def test_parity_on_source(dtype):
+    df = pd.read_csv(SOURCE, dtype=dtype)
+    for col in [c for c in NUMERIC_COLS if c in df.columns]:
+        _assert_same(df[col])
+
+
+def test_dirty_strings():
+    series = pd.Series(["1,237", "23-145", "-5", "", "-", "1e5", "12", "3.5", None], index=range(10, 19))
+    _assert_same(series)
+    assert coerce_numeric(series).iloc[:3].tolist() == [1.0, 23.0, 5.0]
+
+
+@pytest.mark.parametrize("values", [
+    np.array([3, -7, 0, 120], dtype=np.int64),
+    np.array([3, -7, 0, 120], dtype=np.int16),
+    np.array([1.5, -0.25, 0.0, np.nan, 1e-5, 2.5e16, np.inf], dtype=np.float64),
+    np.array([0.1 + 0.2, 1 / 3, -123.456, 1e15 + 0.3], dtype=np.float64),
+    np.array([0.3, 1 / 3, -1.5, 1e7, np.nan], dtype=np.float32),
+])
+def test_typed_fast_paths(values):
+    _assert_same(pd.Series(values, index=range(5, 5 + len(values)), name="x"))